@@ -0,0 +1,105 @@
+"""
+Project detail rendered two ways for a project with many tasks: ORM
+selectin loads encoded by pydantic, and the JSON document built by
+PostgreSQL (src/schemas/sql_json.py).
+
+    cd backend && python -m benchmarks.bench_project_json [tasks] [repeats]
+
+Needs the PostgreSQL database from DATABASE_URL / config.ini. The data is
+created inside a transaction that is rolled back, so nothing is left behind.
+"""
+import asyncio
+import sys
+import time
+from sqlalchemy import select, insert
+from sqlalchemy.orm import selectinload
+from src.database.config import AsyncSessionLocal, engine
+from src.models import Comment, Project, Task, Team, User
+from src.schemas.project import ProjectResponse
+from src.schemas.sql_json import project_document
+from src.responses import model_response
+
+async def seed(db, tasks: int) -> int:
+    users = [User(email=f"bench{i}@example.com", full_name=f"Bench {i}", hashed_password="x") for i in range(20)]
+    db.add_all(users)
+    await db.flush()
+    team = Team(name="Bench", manager_id=users[0].id, members=users)
+    db.add(team)
+    await db.flush()
+    project = Project(name="Bench", manager_id=users[0].id, team_id=team.id)
+    db.add(project)
+    await db.flush()
+    result = await db.execute(
+        insert(Task).returning(Task.id),
+        [
+            {
+                "title": f"Task {i}",
+                "description": "Benchmark task",
+                "project_id": project.id,
+                "assigned_to": users[i % len(users)].id if i % 3 else None,
+            }
+            for i in range(tasks)
+        ],
+    )
+    task_ids = result.scalars().all()
+    await db.execute(
+        insert(Comment),
+        [
+            {"text": f"Comment on {task_id}", "task_id": task_id, "user_id": users[task_id % len(users)].id}
+            for task_id in task_ids[::4]
+        ],
+    )
+    return project.id
+
+async def orm_path(db, project_id: int) -> bytes:
+    result = await db.execute(
+        select(Project)
+        .options(
+            selectinload(Project.manager),
+            selectinload(Project.team).selectinload(Team.members),
+            selectinload(Project.tasks).options(
+                selectinload(Task.assignee),
+                selectinload(Task.comments).selectinload(Comment.user),
+            ),
+        )
+        .where(Project.id == project_id)
+    )
+    body = model_response(ProjectResponse, result.scalar_one()).body
+    db.expunge_all()  # the next run loads everything again
+    return body
+
+async def database_path(db, project_id: int) -> bytes:
+    return (await db.scalar(project_document(Project.id == project_id))).encode()
+
+async def main() -> None:
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    async with AsyncSessionLocal() as db:
+        project_id = await seed(db, tasks)
+        await db.flush()
+        db.expunge_all()
+
+        bodies = {}
+        for name, path in (("orm", orm_path), ("database", database_path)):
+            await path(db, project_id)  # warm up
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                bodies[name] = await path(db, project_id)
+                timings.append(time.perf_counter() - started)
+            print(
+                f"{name:<9} best {min(timings) * 1000:8.1f} ms  "
+                f"median {sorted(timings)[len(timings) // 2] * 1000:8.1f} ms  "
+                f"{len(bodies[name]) / 1024:8.0f} KiB"
+            )
+
+        await db.rollback()
+    await engine.dispose()
+
+    if bodies["orm"] != bodies["database"]:
+        raise SystemExit("database-rendered document differs from the ORM path")
+    print(f"{tasks} tasks: documents are byte-identical")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Memory allocated and time per row to encode the task list: ORM instances
+validated through TaskResponse and json.dumps (the response_model path),
+the same instances through a cached TypeAdapter, and the column projection.
+
+    cd backend && python -m benchmarks.bench_projection [rows]
+
+Runs against an in-memory SQLite database so it needs no server; the
+serialization work it measures is the same as against PostgreSQL.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, noload
+from src.database.config import Base
+from src.models import Task, Project, User
+from src.models.task import TaskPriority, TaskStatus
+from src.schemas.task import TaskResponse
+from src.schemas.projection import task_projection
+from src.responses import model_response
+
+def seed(session: Session, rows: int) -> None:
+    user = User(email="bench@example.com", full_name="Bench", hashed_password="x")
+    project = Project(name="Bench", manager=user)
+    session.add_all([user, project])
+    session.flush()
+    start = datetime(2024, 1, 1)
+    session.add_all([
+        Task(
+            title=f"Task {i}",
+            description="Benchmark task " * 4,
+            due_date=start + timedelta(days=i % 90),
+            priority=list(TaskPriority)[i % 3],
+            status=list(TaskStatus)[i % 3],
+            project_id=project.id,
+            assigned_to=user.id,
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(rows)
+    ])
+    session.commit()
+
+EXCLUDE = {"assignee", "comments"}
+
+def load_tasks(session: Session) -> list:
+    return session.execute(
+        select(Task).options(noload(Task.assignee), noload(Task.comments))
+    ).scalars().all()
+
+def orm_path(session: Session) -> bytes:
+    """What FastAPI's response_model path does: validate, dump, jsonable_encoder, json.dumps"""
+    content = jsonable_encoder([
+        TaskResponse.model_validate(task).model_dump(mode="json", exclude=EXCLUDE)
+        for task in load_tasks(session)
+    ])
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+def adapter_path(session: Session) -> bytes:
+    """ORM instances encoded by a cached TypeAdapter in one pass"""
+    return model_response(
+        List[TaskResponse], load_tasks(session), exclude={"__all__": EXCLUDE}
+    ).body
+
+def projection_path(session: Session) -> bytes:
+    return task_projection.render(session.execute(task_projection.select()).all()).body
+
+def measure(name: str, path, engine, rows: int) -> bytes:
+    """Peak traced memory and wall time per row, each from its own run"""
+    with Session(engine) as session:
+        path(session)  # warm up statement and serializer caches
+    with Session(engine) as session:
+        tracemalloc.start()
+        output = path(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    with Session(engine) as session:
+        started = time.perf_counter()
+        path(session)
+        elapsed = time.perf_counter() - started
+    print(f"{name:<12} {peak / rows:8.0f} B/row allocated at peak  {elapsed / rows * 1e6:7.2f} us/row")
+    return output
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, rows)
+
+    print(f"{rows} tasks")
+    orm = measure("orm", orm_path, engine, rows)
+    for name, path in (("adapter", adapter_path), ("projection", projection_path)):
+        if measure(name, path, engine, rows) != orm:
+            raise SystemExit(f"{name} output differs from the ORM path")
+
+if __name__ == "__main__":
+    main()
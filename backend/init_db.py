@@ -1,41 +1,43 @@
 import asyncio
 import logging
+import sys
 from sqlalchemy import text
-from src.database.config import Base, engine
-from src.models import (
-    User,
-    Team,
-    team_members,
-    Project,
-    Task,
-    Comment,
-    Notification
-)
+from src.database.config import engine
+from src.database.migrations import run_migrations
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def create_tables():
+async def reset_schema():
+    """Drop everything. Development only: all data is lost."""
+    async with engine.begin() as conn:
+        await conn.execute(text('DROP SCHEMA IF EXISTS public CASCADE'))
+        await conn.execute(text('CREATE SCHEMA public'))
+        logger.info("Schema recreated")
+
+async def create_tables(reset: bool = False):
     try:
-        async with engine.begin() as conn:
-            # Drop all tables with CASCADE
-            await conn.execute(text('DROP SCHEMA IF EXISTS public CASCADE'))
-            await conn.execute(text('CREATE SCHEMA public'))
-            logger.info("Schema recreated")
+        if reset:
+            await reset_schema()
 
-            # Create tables in correct order
-            await conn.run_sync(Base.metadata.create_all)
-            logger.info("Tables created successfully")
+        # Create missing tables and apply pending migrations in place
+        applied = await run_migrations(engine)
+        if applied:
+            logger.info(f"Applied migrations: {applied}")
+        else:
+            logger.info("Database schema is up to date")
 
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
+    finally:
+        await engine.dispose()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(create_tables())
+        asyncio.run(create_tables(reset="--reset" in sys.argv))
         logger.info("Database initialization completed")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
-        raise 
\ No newline at end of file
+        raise
@@ -1,9 +1,13 @@
 from .utils import create_access_token, verify_password, get_password_hash
-from .deps import get_current_user
+from .deps import get_current_user, get_current_admin
+from .access import AccessScope, get_access_scope
 
 __all__ = [
     "create_access_token",
     "verify_password",
     "get_password_hash",
-    "get_current_user"
-] 
\ No newline at end of file
+    "get_current_user",
+    "get_current_admin",
+    "AccessScope",
+    "get_access_scope"
+]
\ No newline at end of file
@@ -0,0 +1,152 @@
+from typing import Dict, Iterable, Optional
+from fastapi import Depends
+from sqlalchemy import select, delete, union, or_, and_, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.access import user_project_access
+from src.models.project import Project
+from src.models.task import Task
+from src.models.team import Team, team_members
+from src.models.user import User
+from .deps import get_current_user
+
+def accessible_project_ids(user_id: int):
+    """Subquery of project ids the user can see, from the materialized table"""
+    return (
+        select(user_project_access.c.project_id)
+        .where(user_project_access.c.user_id == user_id)
+        .scalar_subquery()
+    )
+
+def project_access_clause(user_id: int):
+    """Project is managed by the user or belongs to one of the user's teams"""
+    return Project.id.in_(accessible_project_ids(user_id))
+
+def task_project_access_clause(user_id: int):
+    """The task's project is accessible, as an indexed semi-join"""
+    return Task.project_id.in_(accessible_project_ids(user_id))
+
+def task_project_ids(user_id: int):
+    """Projects holding any task the user can see: accessible ones and those of assigned tasks"""
+    return union(
+        select(user_project_access.c.project_id).where(user_project_access.c.user_id == user_id),
+        select(Task.project_id).where(Task.assigned_to == user_id),
+    )
+
+def task_access_clause(user_id: int):
+    """Task is assigned to the user or its project is accessible"""
+    return or_(Task.assigned_to == user_id, task_project_access_clause(user_id))
+
+def team_member_clause(user_id: int):
+    """Team is managed by the user or has the user as a member"""
+    return or_(
+        Team.manager_id == user_id,
+        Team.id.in_(select(team_members.c.team_id).where(team_members.c.user_id == user_id)),
+    )
+
+def _access_source():
+    """Live (user_id, project_id) pairs the materialized table is derived from"""
+    managed = select(
+        Project.manager_id.label("user_id"),
+        Project.id.label("project_id"),
+    )
+    via_team = select(
+        team_members.c.user_id.label("user_id"),
+        Project.id.label("project_id"),
+    ).join(team_members, team_members.c.team_id == Project.team_id)
+    return union(managed, via_team).subquery()
+
+async def refresh_project_access(
+    db: AsyncSession,
+    *,
+    user_ids: Optional[Iterable[int]] = None,
+    project_ids: Optional[Iterable[int]] = None
+) -> None:
+    """
+    Recompute user_project_access rows for the given users and/or projects.
+    Call after flushing any change to project ownership or team membership,
+    in the same transaction as the change.
+    """
+    user_ids = list(user_ids or [])
+    project_ids = list(project_ids or [])
+    if not user_ids and not project_ids:
+        return
+
+    source = _access_source()
+    stale = []
+    fresh = []
+    if user_ids:
+        stale.append(user_project_access.c.user_id.in_(user_ids))
+        fresh.append(source.c.user_id.in_(user_ids))
+    if project_ids:
+        stale.append(user_project_access.c.project_id.in_(project_ids))
+        fresh.append(source.c.project_id.in_(project_ids))
+
+    await db.execute(delete(user_project_access).where(or_(*stale)))
+    await db.execute(
+        pg_insert(user_project_access)
+        .from_select(
+            ["user_id", "project_id"],
+            select(source.c.user_id, source.c.project_id).where(or_(*fresh))
+        )
+        .on_conflict_do_nothing()
+    )
+
+class AccessScope:
+    """
+    Per-request view of what the current user can see. Every answer is
+    memoized, so repeated checks within a request cost one query at most.
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self._projects: Dict[int, Optional[bool]] = {}
+        self._tasks: Dict[int, bool] = {}
+
+    async def project_access(self, db: AsyncSession, project_id: int) -> Optional[bool]:
+        """None if the project does not exist, otherwise whether it is accessible"""
+        if project_id not in self._projects:
+            result = await db.execute(
+                select(user_project_access.c.user_id.is_not(None))
+                .select_from(Project)
+                .outerjoin(
+                    user_project_access,
+                    and_(
+                        user_project_access.c.project_id == Project.id,
+                        user_project_access.c.user_id == self.user_id,
+                    ),
+                )
+                .where(Project.id == project_id)
+            )
+            self._projects[project_id] = result.scalar_one_or_none()
+        return self._projects[project_id]
+
+    async def projects_access(self, db: AsyncSession, project_ids: Iterable[int]) -> Dict[int, Optional[bool]]:
+        """project_access for many projects, in one query for the unknown ones"""
+        project_ids = set(project_ids)
+        missing = [pid for pid in project_ids if pid not in self._projects]
+        if missing:
+            result = await db.execute(
+                select(Project.id, user_project_access.c.user_id.is_not(None))
+                .outerjoin(
+                    user_project_access,
+                    and_(
+                        user_project_access.c.project_id == Project.id,
+                        user_project_access.c.user_id == self.user_id,
+                    ),
+                )
+                .where(Project.id.in_(missing))
+            )
+            self._projects.update({pid: None for pid in missing})
+            self._projects.update(dict(result.all()))
+        return {pid: self._projects[pid] for pid in project_ids}
+
+    async def can_view_task(self, db: AsyncSession, task_id: int) -> bool:
+        if task_id not in self._tasks:
+            self._tasks[task_id] = bool(await db.scalar(
+                select(exists().where(Task.id == task_id, task_access_clause(self.user_id)))
+            ))
+        return self._tasks[task_id]
+
+async def get_access_scope(current_user: User = Depends(get_current_user)) -> AccessScope:
+    return AccessScope(current_user.id)
@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy.orm import make_transient_to_detached
+from src.models.user import User
+from .utils import config
+
+PRINCIPAL_CACHE_TTL = config.getfloat('auth', 'principal_cache_ttl', fallback=60.0)
+PRINCIPAL_CACHE_SIZE = config.getint('auth', 'principal_cache_size', fallback=10000)
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+class PrincipalCache:
+    """
+    LRU cache of authenticated users keyed by token subject. Entries hold
+    plain column values and expire after max_age seconds, so a user removed
+    or deactivated on another worker drops out within that window.
+    """
+
+    def __init__(self, max_age: float, max_size: int):
+        self.max_age = max_age
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[User]:
+        entry = self._entries.get(subject)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[subject]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        return self._to_user(entry[1])
+
+    def put(self, subject: str, user: User) -> None:
+        if self.max_age <= 0 or self.max_size <= 0:
+            return
+        values = {key: getattr(user, key) for key in _USER_COLUMNS}
+        self._entries[subject] = (time.monotonic() + self.max_age, values)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        self._entries.pop(subject, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for subject in [s for s, (_, values) in self._entries.items() if values["id"] == user_id]:
+            del self._entries[subject]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _to_user(values: dict) -> User:
+        # A fresh detached instance per request, never shared between sessions
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE)
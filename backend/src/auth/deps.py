@@ -3,17 +3,27 @@ from fastapi.security import OAuth2PasswordBearer
 import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from src.database.config import get_db
-from src.models.user import User
+from src.database.config import get_read_db
+from src.models.user import User, UserRole
 from src.schemas.user import TokenData
 from .utils import SECRET_KEY, ALGORITHM
+from .cache import principal_cache
+from .revocation import revocation_list
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> User:
+    """
+    The authenticated user, detached. Use its columns only: reading a
+    relationship raises DetachedInstanceError. Endpoints that need
+    relationships load them, e.g. with select(User).options(...).
+    Lookups use a read session (the replica when configured), so GETs never
+    check out a primary read-write connection to authenticate.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,6 +38,14 @@ async def get_current_user(
         token_data = TokenData(email=email)
     except jwt.InvalidTokenError:
         raise credentials_exception
+
+    jti = payload.get("jti")
+    if jti and await revocation_list.is_revoked(db, jti):
+        raise credentials_exception
+
+    user = principal_cache.get(token_data.email)
+    if user is not None:
+        return user
         
     result = await db.execute(
         select(User).where(User.email == token_data.email)
@@ -36,4 +54,13 @@ async def get_current_user(
     
     if user is None:
         raise credentials_exception
-    return user 
\ No newline at end of file
+    principal_cache.put(token_data.email, user)
+    # Detached like a cached principal, so write sessions can attach it
+    db.expunge(user)
+    return user
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """The authenticated user, who must be an admin"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .utils import config, verify_password, get_password_hash
+
+HASH_WORKERS = config.getint('auth', 'hash_workers', fallback=4)
+HASH_QUEUE_SIZE = config.getint('auth', 'hash_queue_size', fallback=32)
+HASH_RETRY_AFTER = config.getint('auth', 'hash_retry_after', fallback=1)
+
+class HashQueueFull(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool so the event loop keeps serving
+    other requests. bcrypt releases the GIL, so workers hash in parallel.
+    At most max_queue calls wait for a worker; beyond that callers are
+    rejected immediately instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_queue: int, window: int = 1024):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_latency = 0.0
+
+    async def _run(self, func, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HashQueueFull()
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            latency = time.perf_counter() - start
+            self.in_flight -= 1
+            self.completed += 1
+            self.max_latency = max(self.max_latency, latency)
+            self._latencies.append(latency)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self._latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "latency_p99_ms": round(p99 * 1000, 3),
+            "latency_max_ms": round(self.max_latency * 1000, 3),
+        }
+
+password_hasher = PasswordHasher(HASH_WORKERS, HASH_QUEUE_SIZE)
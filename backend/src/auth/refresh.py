@@ -0,0 +1,100 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select, update, delete, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.refresh_token import RefreshToken
+from src.models.user import User
+from .utils import config
+
+REFRESH_TOKEN_EXPIRE_DAYS = config.getint('auth', 'refresh_token_expire_days', fallback=30)
+
+class RefreshTokenError(Exception):
+    """The refresh token is malformed, unknown, expired, revoked or reused"""
+
+def _new_id() -> str:
+    return secrets.token_urlsafe(16)
+
+def _digest(secret: str) -> bytes:
+    return hashlib.sha256(secret.encode('utf-8')).digest()
+
+async def issue_refresh_token(
+    db: AsyncSession,
+    user_id: int,
+    family_id: Optional[str] = None
+) -> str:
+    """Store a new refresh token and return it as '<id>.<secret>'"""
+    token_id = _new_id()
+    secret = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        id=token_id,
+        token_hash=_digest(secret),
+        family_id=family_id or _new_id(),
+        user_id=user_id,
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    await db.flush()
+    return f"{token_id}.{secret}"
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[str, str]:
+    """
+    Spend a refresh token and return (user email, replacement token).
+    Presenting an already spent token revokes its whole family, since it
+    means the token was copied.
+    """
+    token_id, _, secret = token.partition(".")
+    if not token_id or not secret:
+        raise RefreshTokenError("Malformed refresh token")
+
+    # Single primary-key lookup, locked so concurrent refreshes serialize
+    result = await db.execute(
+        select(RefreshToken, User.email, User.is_active)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.id == token_id)
+        .with_for_update(of=RefreshToken)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise RefreshTokenError("Unknown refresh token")
+    stored, email, is_active = row
+
+    if not hmac.compare_digest(stored.token_hash, _digest(secret)):
+        raise RefreshTokenError("Unknown refresh token")
+    if stored.revoked or stored.expires_at < datetime.utcnow() or not is_active:
+        raise RefreshTokenError("Refresh token is no longer valid")
+    if stored.used_at is not None:
+        await revoke_family(db, stored.family_id)
+        await db.commit()
+        raise RefreshTokenError("Refresh token reuse detected")
+
+    stored.used_at = datetime.utcnow()
+    replacement = await issue_refresh_token(db, stored.user_id, stored.family_id)
+    return email, replacement
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Revoke the family of a presented refresh token, if the token is genuine"""
+    token_id, _, secret = token.partition(".")
+    stored = await db.get(RefreshToken, token_id) if token_id else None
+    if stored is not None and hmac.compare_digest(stored.token_hash, _digest(secret)):
+        await revoke_family(db, stored.family_id)
+
+async def revoke_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id)
+        .values(revoked=True)
+    )
+
+async def purge_refresh_tokens(db: AsyncSession) -> int:
+    """
+    Delete expired tokens and revoked families, which can never be spent
+    again. Spent but unexpired tokens stay for reuse detection.
+    """
+    result = await db.execute(
+        delete(RefreshToken)
+        .where(or_(RefreshToken.expires_at < datetime.utcnow(), RefreshToken.revoked))
+    )
+    await db.commit()
+    return result.rowcount
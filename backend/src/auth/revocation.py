@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, delete, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.config import AsyncSessionLocal
+from src.models.revoked_token import RevokedToken
+from .utils import config
+
+REVOCATION_CAPACITY = config.getint('auth', 'revocation_capacity', fallback=100000)
+REVOCATION_ERROR_RATE = config.getfloat('auth', 'revocation_error_rate', fallback=0.001)
+REVOCATION_SYNC_SECONDS = config.getfloat('auth', 'revocation_sync_seconds', fallback=5.0)
+
+# Incremental syncs re-read this far back so revocations committed late by a
+# slow transaction (or stamped by a worker with a lagging clock) are not missed
+SYNC_LOOKBACK = timedelta(seconds=60)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+class RevocationList:
+    """
+    Revoked access token ids. The table is authoritative; an in-process
+    Bloom filter answers the common "not revoked" case without a query, so
+    only filter positives (real or false) reach the database. Revocations
+    made by other workers are picked up every sync_seconds.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.bloom: Optional[BloomFilter] = None
+        self._synced_until: Optional[datetime] = None
+        self._next_sync = 0.0
+        self.filter_negatives = 0
+        self.db_checks = 0
+        self._load_lock = asyncio.Lock()
+
+    async def load(self, stale: Optional[BloomFilter] = None) -> None:
+        """
+        Purge expired rows and rebuild the filter from the table, on a session
+        of its own so no request's transaction is committed. Concurrent calls
+        rebuild once: callers pass the filter they found stale, and a waiter
+        whose filter was already replaced returns.
+        """
+        async with self._load_lock:
+            if self.bloom is not stale:
+                return
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+                await db.commit()
+                result = await db.execute(select(RevokedToken.jti, RevokedToken.revoked_at))
+                rows = result.all()
+
+            capacity = self.capacity
+            while capacity < len(rows) * 2:
+                capacity *= 2
+            bloom = BloomFilter(capacity, self.error_rate)
+            for jti, _ in rows:
+                bloom.add(jti)
+            self.capacity = capacity
+            self.bloom = bloom
+            self._synced_until = max((revoked_at for _, revoked_at in rows), default=datetime.utcnow())
+            self._next_sync = time.monotonic() + self.sync_seconds
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Add revocations recorded since the last sync, rebuilding when full"""
+        if self.bloom is None or self.bloom.count >= self.bloom.capacity:
+            await self.load(stale=self.bloom)
+            return
+        if time.monotonic() < self._next_sync:
+            return
+        self._next_sync = time.monotonic() + self.sync_seconds
+        result = await db.execute(
+            select(RevokedToken.jti, RevokedToken.revoked_at)
+            .where(RevokedToken.revoked_at >= self._synced_until - SYNC_LOOKBACK)
+        )
+        for jti, revoked_at in result.all():
+            if jti not in self.bloom:
+                self.bloom.add(jti)
+            self._synced_until = max(self._synced_until, revoked_at)
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        await self.sync(db)
+        if jti not in self.bloom:
+            self.filter_negatives += 1
+            return False
+        self.db_checks += 1
+        return bool(await db.scalar(select(exists().where(RevokedToken.jti == jti))))
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: datetime) -> None:
+        await db.execute(
+            pg_insert(RevokedToken)
+            .values(jti=jti, expires_at=expires_at, revoked_at=datetime.utcnow())
+            .on_conflict_do_nothing()
+        )
+        if self.bloom is not None and jti not in self.bloom:
+            self.bloom.add(jti)
+
+    def snapshot(self) -> dict:
+        return {
+            "loaded": self.bloom is not None,
+            "entries": self.bloom.count if self.bloom else 0,
+            "capacity": self.capacity,
+            "filter_negatives": self.filter_negatives,
+            "db_checks": self.db_checks,
+        }
+
+revocation_list = RevocationList(REVOCATION_CAPACITY, REVOCATION_ERROR_RATE, REVOCATION_SYNC_SECONDS)
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 import jwt
+import uuid
 import bcrypt
 from typing import Optional
 import configparser
@@ -12,6 +13,7 @@ config.read(config_path)
 
 SECRET_KEY = config['auth']['secret_key']
 ALGORITHM = config['auth']['algorithm']
+ACCESS_TOKEN_EXPIRE_MINUTES = config.getint('auth', 'access_token_expire_minutes', fallback=15)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
@@ -28,7 +30,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    # Unique id so a single token can be revoked on logout
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt 
\ No newline at end of file
@@ -0,0 +1,80 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from fastapi import Depends
+from sqlalchemy import select, any_, literal, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.project import Project
+from src.models.task import Task
+from src.models.user import User
+from .config import get_db
+
+class Loaders:
+    """
+    Request-scoped DataLoader for rows by id. Every load() made in the same
+    event-loop tick is collected and answered with one WHERE id = ANY(:ids)
+    query per entity; results, None for a missing id, are cached for the
+    rest of the request. Batches run one at a time on the request's session,
+    so loads gathered concurrently never use it concurrently.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._results: Dict[Tuple[type, int], asyncio.Future] = {}
+        self._pending: Dict[type, List[int]] = defaultdict(list)
+        self._dispatches = set()
+        self._lock = asyncio.Lock()
+
+    def load(self, entity, id: int) -> asyncio.Future:
+        """Future resolving to the entity with this id, or None"""
+        key = (entity, id)
+        future = self._results.get(key)
+        if future is None or future.cancelled():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._results[key] = future
+            if not self._pending:
+                # Dispatch once the other tasks of this tick have queued their loads
+                loop.call_soon(self._schedule)
+            self._pending[entity].append(id)
+        return future
+
+    def user(self, id: int) -> asyncio.Future:
+        return self.load(User, id)
+
+    def task(self, id: int) -> asyncio.Future:
+        return self.load(Task, id)
+
+    def project(self, id: int) -> asyncio.Future:
+        return self.load(Project, id)
+
+    def _schedule(self) -> None:
+        dispatch = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(dispatch)
+        dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self) -> None:
+        pending, self._pending = self._pending, defaultdict(list)
+        async with self._lock:
+            for entity, ids in pending.items():
+                futures = [self._results[(entity, id)] for id in ids]
+                try:
+                    result = await self.db.execute(
+                        select(entity).where(entity.id == any_(literal(ids, ARRAY(Integer))))
+                    )
+                    found = {obj.id: obj for obj in result.scalars()}
+                except Exception as e:
+                    for id, future in zip(ids, futures):
+                        # Not cached, so a later load retries
+                        self._results.pop((entity, id), None)
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for id, future in zip(ids, futures):
+                    if not future.done():
+                        future.set_result(found.get(id))
+
+async def get_loaders(db: AsyncSession = Depends(get_db)) -> Loaders:
+    """Loaders sharing the request's read-write session"""
+    return Loaders(db)
@@ -0,0 +1,330 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple, Union
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from .config import Base
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_advisory_lock so two deploys never migrate at once
+MIGRATION_LOCK_KEY = 727274
+
+Step = Union[str, Callable[[AsyncConnection], object]]
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A numbered schema change. Steps are SQL strings or async callables taking
+    the connection. Non-transactional migrations run every step in autocommit
+    mode, which CREATE INDEX CONCURRENTLY requires.
+    """
+    version: int
+    name: str
+    steps: Tuple[Step, ...]
+    transactional: bool = True
+
+def concurrent_index(
+    name: str, table: str, columns: Sequence[str], unique: bool = False, using: Optional[str] = None
+) -> Step:
+    """
+    Build an index without blocking writes. A previous interrupted attempt
+    leaves an INVALID index behind, which is dropped and rebuilt.
+    """
+    async def step(conn: AsyncConnection):
+        invalid = await conn.scalar(
+            text(
+                "SELECT NOT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+            ),
+            {"name": name},
+        )
+        if invalid:
+            logger.warning(f"Dropping invalid index {name} left by an interrupted migration")
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        await conn.execute(text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS "
+            f"{name} ON {table} {f'USING {using} ' if using else ''}({', '.join(columns)})"
+        ))
+    return step
+
+# Search documents of tasks and comments; {row} is "NEW." inside the trigger
+TASK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+)
+COMMENT_SEARCH_VECTOR = "setweight(to_tsvector('simple', coalesce({row}text, '')), 'C')"
+
+def search_vector_trigger(table: str, columns: str, expression: str) -> Tuple[str, ...]:
+    """BEFORE trigger keeping table.search_vector current as rows are written"""
+    function = f"{table}_search_vector_update"
+    return (
+        f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        f"BEGIN NEW.search_vector := {expression.format(row='NEW.')}; RETURN NEW; END $$",
+        f"DROP TRIGGER IF EXISTS {function} ON {table}",
+        f"CREATE TRIGGER {function} BEFORE INSERT OR UPDATE OF {columns} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {function}()",
+    )
+
+def batched_update(table: str, column: str, expression: str, batch_size: int = 5000) -> Step:
+    """
+    Fill column for existing rows in primary-key ranges of batch_size, one
+    short transaction each, so no lock is held on the whole table. Rows
+    already filled (e.g. by a trigger) are skipped.
+    """
+    async def step(conn: AsyncConnection):
+        last_id = await conn.scalar(text(f"SELECT max(id) FROM {table}")) or 0
+        for start in range(0, last_id, batch_size):
+            await conn.execute(
+                text(
+                    f"UPDATE {table} SET {column} = {expression} "
+                    f"WHERE id > :start AND id <= :end AND {column} IS NULL"
+                ),
+                {"start": start, "end": start + batch_size},
+            )
+    return step
+
+async def _team_members_primary_key(conn: AsyncConnection):
+    """Key team_members on (team_id, user_id), building the index online first"""
+    has_primary_key = await conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_constraint "
+        "WHERE conrelid = 'team_members'::regclass AND contype = 'p')"
+    ))
+    if has_primary_key:
+        return
+    await concurrent_index(
+        "ix_team_members_team_id_user_id", "team_members", ["team_id", "user_id"], unique=True
+    )(conn)
+    await conn.execute(text(
+        "ALTER TABLE team_members ADD CONSTRAINT team_members_pkey "
+        "PRIMARY KEY USING INDEX ix_team_members_team_id_user_id"
+    ))
+
+async def _user_trigram_indexes(conn: AsyncConnection):
+    """
+    pg_trgm GIN indexes for user search, when the server ships the extension.
+    Without it user search falls back to its in-process index; once pg_trgm is
+    available, delete version 9 from schema_migrations and restart to build them.
+    """
+    available = await conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+    ))
+    if not available:
+        logger.warning("pg_trgm is not available; user search will use the in-process index")
+        return
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    await concurrent_index("ix_users_full_name_trgm", "users", ["full_name gin_trgm_ops"], using="gin")(conn)
+    await concurrent_index("ix_users_email_trgm", "users", ["email gin_trgm_ops"], using="gin")(conn)
+
+# Statement-level, so a bulk write bumps each project it touched once. The
+# cost: the bump UPDATEs the parent projects row inside the task write's
+# transaction, so concurrent task writes in one project queue on that row
+# lock until commit, and each bump leaves a dead projects tuple for vacuum
+# (version is not indexed, so these stay HOT updates). Writes embedded in
+# task lists but not made to tasks (users, comments) must bump on their own,
+# see user_references_changed.
+PROJECT_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_project_version() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects SET version = version + 1 WHERE id IN (SELECT project_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE projects SET version = version + 1 WHERE id IN (SELECT project_id FROM old_rows);
+    ELSE
+        UPDATE projects SET version = version + 1
+        WHERE id IN (SELECT project_id FROM old_rows UNION SELECT project_id FROM new_rows);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+def _project_version_trigger(event: str, tables: str) -> Tuple[str, str]:
+    name = f"tasks_bump_project_version_{event.lower()}"
+    return (
+        f"DROP TRIGGER IF EXISTS {name} ON tasks",
+        f"CREATE TRIGGER {name} AFTER {event} ON tasks REFERENCING {tables} "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_project_version()",
+    )
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "team_members integrity",
+        (
+            "DELETE FROM team_members WHERE team_id IS NULL OR user_id IS NULL",
+            "DELETE FROM team_members a USING team_members b "
+            "WHERE a.ctid < b.ctid AND a.team_id = b.team_id AND a.user_id = b.user_id",
+            "ALTER TABLE team_members ALTER COLUMN team_id SET NOT NULL",
+            "ALTER TABLE team_members ALTER COLUMN user_id SET NOT NULL",
+        ),
+    ),
+    Migration(
+        2,
+        "access control indexes",
+        (
+            _team_members_primary_key,
+            concurrent_index("ix_team_members_user_id", "team_members", ["user_id"]),
+            concurrent_index("ix_projects_manager_id", "projects", ["manager_id"]),
+            concurrent_index("ix_projects_team_id", "projects", ["team_id"]),
+            concurrent_index("ix_tasks_project_id_created_at", "tasks", ["project_id", "created_at"]),
+            concurrent_index("ix_tasks_assigned_to", "tasks", ["assigned_to"]),
+            concurrent_index("ix_tasks_created_at", "tasks", ["created_at"]),
+            concurrent_index("ix_comments_task_id_created_at", "comments", ["task_id", "created_at"]),
+            concurrent_index("ix_notifications_user_id_is_read", "notifications", ["user_id", "is_read"]),
+        ),
+        transactional=False,
+    ),
+    Migration(
+        3,
+        "backfill user_project_access",
+        (
+            "INSERT INTO user_project_access (user_id, project_id) "
+            "SELECT manager_id, id FROM projects WHERE manager_id IS NOT NULL "
+            "UNION "
+            "SELECT tm.user_id, p.id FROM projects p "
+            "JOIN team_members tm ON tm.team_id = p.team_id "
+            "ON CONFLICT DO NOTHING",
+        ),
+    ),
+    Migration(
+        4,
+        "task listing keyset indexes",
+        (
+            concurrent_index("ix_tasks_created_at_id", "tasks", ["created_at", "id"]),
+            concurrent_index("ix_tasks_project_id_created_at_id", "tasks", ["project_id", "created_at", "id"]),
+            concurrent_index("ix_tasks_assigned_to_created_at_id", "tasks", ["assigned_to", "created_at", "id"]),
+            concurrent_index("ix_tasks_status_created_at_id", "tasks", ["status", "created_at", "id"]),
+            concurrent_index("ix_tasks_due_date", "tasks", ["due_date"]),
+            # Superseded by the indexes above, which also cover their prefixes
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_created_at",
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_project_id_created_at",
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_assigned_to",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        5,
+        "updated_at for conditional GET",
+        (
+            # now() is evaluated once, so existing rows need no table rewrite
+            "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+            "ALTER TABLE projects ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+            "ALTER TABLE teams ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+        ),
+    ),
+    Migration(
+        6,
+        "task full-text search",
+        (
+            # Nullable with no default: a catalog change, no table rewrite
+            "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector",
+            "ALTER TABLE comments ADD COLUMN IF NOT EXISTS search_vector tsvector",
+            *search_vector_trigger("tasks", "title, description", TASK_SEARCH_VECTOR),
+            *search_vector_trigger("comments", "text", COMMENT_SEARCH_VECTOR),
+            batched_update("tasks", "search_vector", TASK_SEARCH_VECTOR.format(row="")),
+            batched_update("comments", "search_vector", COMMENT_SEARCH_VECTOR.format(row="")),
+            concurrent_index("ix_tasks_search_vector", "tasks", ["search_vector"], using="gin"),
+            concurrent_index("ix_comments_search_vector", "comments", ["search_vector"], using="gin"),
+        ),
+        transactional=False,
+    ),
+    Migration(
+        7,
+        "project board index",
+        (
+            concurrent_index(
+                "ix_tasks_project_id_status_created_at_id",
+                "tasks",
+                ["project_id", "status", "created_at DESC", "id DESC"],
+            ),
+        ),
+        transactional=False,
+    ),
+    Migration(
+        8,
+        "team manager index",
+        (concurrent_index("ix_teams_manager_id", "teams", ["manager_id"]),),
+        transactional=False,
+    ),
+    Migration(
+        9,
+        "user search trigram indexes",
+        (_user_trigram_indexes,),
+        transactional=False,
+    ),
+    Migration(
+        10,
+        "project version counters",
+        (
+            # A constant default, so no table rewrite
+            "ALTER TABLE projects ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0",
+            PROJECT_VERSION_FUNCTION,
+            *_project_version_trigger("INSERT", "NEW TABLE AS new_rows"),
+            *_project_version_trigger("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            *_project_version_trigger("DELETE", "OLD TABLE AS old_rows"),
+        ),
+    ),
+]
+
+async def _run_step(conn: AsyncConnection, step: Step) -> None:
+    if isinstance(step, str):
+        await conn.execute(text(step))
+    else:
+        await step(conn)
+
+async def _record(conn: AsyncConnection, migration: Migration) -> None:
+    await conn.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name},
+    )
+
+async def run_migrations(engine: AsyncEngine) -> list:
+    """
+    Create missing tables and apply pending migrations in version order.
+    Existing data is never dropped. Returns the versions that were applied.
+    """
+    import src.models  # noqa: F401 - register every table on Base.metadata
+
+    applied_now = []
+    async with engine.connect() as lock_conn:
+        lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                    "version INTEGER PRIMARY KEY, "
+                    "name VARCHAR NOT NULL, "
+                    "applied_at TIMESTAMP NOT NULL DEFAULT now())"
+                ))
+                await conn.run_sync(Base.metadata.create_all)
+                result = await conn.execute(text("SELECT version FROM schema_migrations"))
+                applied = {row[0] for row in result}
+
+            for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+                if migration.version in applied:
+                    continue
+                logger.info(f"Applying migration {migration.version}: {migration.name}")
+                if migration.transactional:
+                    async with engine.begin() as conn:
+                        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+                        for step in migration.steps:
+                            await _run_step(conn, step)
+                        await _record(conn, migration)
+                else:
+                    async with engine.connect() as conn:
+                        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                        # Index builds on large tables outlive the app's statement timeout
+                        await conn.execute(text("SET statement_timeout = 0"))
+                        try:
+                            for step in migration.steps:
+                                await _run_step(conn, step)
+                            await _record(conn, migration)
+                        finally:
+                            await conn.execute(text("RESET statement_timeout"))
+                applied_now.append(migration.version)
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+    return applied_now
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence
+from sqlalchemy import tuple_
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by encode_cursor"""
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque, URL-safe cursor for the sort key of the last row on a page"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _matches(value, expected: type) -> bool:
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        # json writes whole floats as 1.0, but accept 1 as well
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list:
+    """
+    Sort key values of a cursor, which must have one value of each of types
+    (e.g. (datetime, int) for created_at, id), so a tampered cursor never
+    reaches the database as a mistyped comparison.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise InvalidCursor("Invalid cursor")
+        values = [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if len(values) != len(types) or not all(map(_matches, values, types)):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+def keyset_after(
+    columns: Sequence,
+    cursor: Optional[str],
+    types: Sequence[type],
+    descending: bool = True
+):
+    """
+    Row-value predicate selecting rows strictly after the cursor in
+    (columns...) order, or None for the first page. Backed by a btree on the
+    same columns, each page is an index range scan no matter how deep.
+    """
+    if not cursor:
+        return None
+    values = decode_cursor(cursor, types)
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+class PoolStats:
+    """Checkout wait times for a single pool, kept in a bounded window"""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._waits.append(wait)
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            waits = sorted(self._waits)
+        if not waits:
+            return 0.0
+        index = min(len(waits) - 1, int(round(pct / 100 * (len(waits) - 1))))
+        return waits[index]
+
+    def snapshot(self) -> dict:
+        attempts = self.checkouts + self.timeouts
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+            "wait_p50_ms": round(self.percentile(50) * 1000, 3),
+            "wait_p99_ms": round(self.percentile(99) * 1000, 3),
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+        }
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long callers wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+def pool_status(pool) -> dict:
+    """Current occupancy of a pool plus its checkout wait statistics"""
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
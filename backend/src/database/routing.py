@@ -0,0 +1,50 @@
+import time
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Cookie carrying the time of the client's last write
+WRITE_PIN_COOKIE = "last_write"
+
+class WritePin:
+    """
+    Read-your-writes window. Replicas lag behind the primary, so for a short
+    window after a write the writer's reads go to the primary. The write time
+    travels with the client in a cookie, so the pin holds whichever worker
+    serves the next request. A forged cookie only costs a primary read.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+
+    def mark(self, request: Request) -> None:
+        """Record that this request committed a write"""
+        request.state.wrote_at = time.time()
+
+    def set_cookie(self, request: Request, response: Response) -> None:
+        wrote_at = getattr(request.state, "wrote_at", None)
+        if wrote_at is None or self.window_seconds <= 0:
+            return
+        response.set_cookie(
+            WRITE_PIN_COOKIE,
+            f"{wrote_at:.3f}",
+            max_age=max(1, int(self.window_seconds + 0.999)),
+            httponly=True,
+            samesite="lax",
+        )
+
+    def is_pinned(self, request: Request) -> bool:
+        try:
+            wrote_at = float(request.cookies.get(WRITE_PIN_COOKIE, ""))
+        except ValueError:
+            return False
+        return 0 <= time.time() - wrote_at < self.window_seconds
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
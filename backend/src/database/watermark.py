@@ -0,0 +1,26 @@
+from sqlalchemy import select, update, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def digest(key, *versions):
+    """
+    Fingerprint of a set of rows: md5 over each row's key and versions, in
+    key order. It moves when a row joins or leaves the set or any version
+    changes, and reads only the rows of the set.
+    """
+    row = func.concat_ws(":", key, *versions)
+    return func.coalesce(func.md5(func.string_agg(row, aggregate_order_by(literal_column("','"), key))), "")
+
+async def fetch_watermark(db: AsyncSession, *queries) -> tuple:
+    """Run several digest() selects in one round trip, as one flat tuple"""
+    subqueries = [query.subquery() for query in queries]
+    result = await db.execute(select(*[column for sub in subqueries for column in sub.c]))
+    return tuple(result.one())
+
+def touch(entity, *ids):
+    """UPDATE bumping updated_at, for changes that do not write the row itself"""
+    return update(entity).where(entity.id.in_(ids)).values(updated_at=func.now())
+
+def bump(entity, *where):
+    """UPDATE incrementing the version counter of the rows matching where"""
+    return update(entity).where(*where).values(version=entity.version + 1)
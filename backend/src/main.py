@@ -6,7 +6,11 @@ from src.routers.users import router as users_router
 from src.routers.teams import router as teams_router
 from src.routers.projects import router as projects_router
 from src.routers.tasks import router as tasks_router
-from src.database.config import engine, Base
+from src.routers.metrics import router as metrics_router
+from src.database.config import engine, Base, AsyncSessionLocal, write_pin
+from src.auth.revocation import revocation_list
+from src.auth.refresh import purge_refresh_tokens
+from src.responses import FastJSONResponse
 from src.auth.deps import get_current_user
 from fastapi.responses import RedirectResponse
 import uvicorn
@@ -23,7 +27,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Task Manager API")
+app = FastAPI(title="Task Manager API", default_response_class=FastJSONResponse)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -49,6 +53,13 @@ async def log_requests(request: Request, call_next):
         logger.error(f"Request failed: {request.method} {request.url} - Error: {str(e)}")
         raise
 
+@app.middleware("http")
+async def pin_writers(request: Request, call_next):
+    # Pins the client to the primary after a committed write (read-your-writes)
+    response = await call_next(request)
+    write_pin.set_cookie(request, response)
+    return response
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +67,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include routers
@@ -65,11 +77,31 @@ try:
     app.include_router(teams_router, prefix="/teams", tags=["teams"])
     app.include_router(projects_router, prefix="/projects", tags=["projects"])
     app.include_router(tasks_router)  # No prefix here since it's in the router
+    app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
     logger.info("All routers included successfully")
 except Exception as e:
     logger.error(f"Error including routers: {e}")
     raise
 
+@app.on_event("startup")
+async def load_revocation_list():
+    # Otherwise the filter is built lazily by the first authenticated request
+    try:
+        await revocation_list.load()
+        logger.info("Token revocation list loaded")
+    except Exception as e:
+        logger.error(f"Failed to load token revocation list: {e}")
+
+@app.on_event("startup")
+async def purge_stale_refresh_tokens():
+    # Rows are otherwise never deleted; every worker start trims the table
+    try:
+        async with AsyncSessionLocal() as session:
+            purged = await purge_refresh_tokens(session)
+        logger.info(f"Purged {purged} stale refresh tokens")
+    except Exception as e:
+        logger.error(f"Failed to purge refresh tokens: {e}")
+
 # Add redirect for old tasks URL
 @app.get("/tasks", include_in_schema=False)
 @app.get("/tasks/{path:path}", include_in_schema=False)
@@ -4,6 +4,9 @@ from .project import Project
 from .task import Task, TaskStatus
 from .comment import Comment
 from .notification import Notification
+from .access import user_project_access
+from .refresh_token import RefreshToken
+from .revoked_token import RevokedToken
 
 __all__ = [
     "User",
@@ -14,5 +17,8 @@ __all__ = [
     "Task",
     "TaskStatus",
     "Comment",
-    "Notification"
+    "Notification",
+    "user_project_access",
+    "RefreshToken",
+    "RevokedToken"
 ] 
\ No newline at end of file
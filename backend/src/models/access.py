@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey, Table, Index
+from src.database.config import Base
+
+# Materialized "user can see project" pairs, derived from projects.manager_id
+# and team_members. Maintained by src.auth.access.refresh_project_access.
+user_project_access = Table(
+    'user_project_access',
+    Base.metadata,
+    Column('user_id', Integer, ForeignKey('users.id', ondelete="CASCADE"), primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True),
+    Index('ix_user_project_access_project_id', 'project_id')
+)
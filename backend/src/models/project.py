@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, func
 from sqlalchemy.orm import relationship
 from src.database.config import Base
 
@@ -8,11 +8,15 @@ class Project(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    team_id = Column(Integer, ForeignKey('teams.id', ondelete="CASCADE"), nullable=True)
+    team_id = Column(Integer, ForeignKey('teams.id', ondelete="CASCADE"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    manager_id = Column(Integer, ForeignKey('users.id', ondelete="SET NULL"), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    manager_id = Column(Integer, ForeignKey('users.id', ondelete="SET NULL"), nullable=False, index=True)
+    # Incremented by a trigger on every write to the project's tasks (migration 10)
+    version = Column(BigInteger, nullable=False, server_default="0")
 
     # Relationships
     team = relationship("Team", back_populates="projects")
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    # Ordered so the ORM and database-rendered documents list tasks alike
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", order_by="Task.id")
     manager = relationship("User", foreign_keys=[manager_id], back_populates="managed_projects") 
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, LargeBinary
+from datetime import datetime
+from src.database.config import Base
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # Public half of the token; the secret half is only stored hashed
+    id = Column(String(22), primary_key=True)
+    token_hash = Column(LargeBinary(32), nullable=False)
+    # All tokens rotated from the same login share a family
+    family_id = Column(String(22), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from src.database.config import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    # Rows can be purged once the access token would have expired anyway
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -16,6 +16,15 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id); each filter that
+        # narrows the listing has an index ending in the same sort key
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tasks_due_date", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -24,6 +33,8 @@ class Task(Base):
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    # Database clock; any write here also bumps the project's version
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Foreign keys
     project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"))
@@ -32,4 +43,11 @@ class Task(Base):
     # Relationships
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", backref="assigned_tasks")
-    comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan") 
\ No newline at end of file
+    comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan", order_by="Comment.id")
+
+# Board columns: one forward scan yields each status newest first, the
+# order the board's window function partitions and sorts by
+Index(
+    "ix_tasks_project_id_status_created_at_id",
+    Task.project_id, Task.status, Task.created_at.desc(), Task.id.desc()
+) 
\ No newline at end of file
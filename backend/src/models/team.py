@@ -1,14 +1,15 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, Index, func, select
+from sqlalchemy.orm import relationship, column_property
 from src.database.config import Base
 
 # Association table for team members
 team_members = Table(
     'team_members',
     Base.metadata,
-    Column('team_id', Integer, ForeignKey('teams.id', ondelete="CASCADE")),
-    Column('user_id', Integer, ForeignKey('users.id', ondelete="CASCADE"))
+    Column('team_id', Integer, ForeignKey('teams.id', ondelete="CASCADE"), primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id', ondelete="CASCADE"), primary_key=True),
+    Index('ix_team_members_user_id', 'user_id')
 )
 
 class Team(Base):
@@ -17,9 +18,16 @@ class Team(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    manager_id = Column(Integer, ForeignKey('users.id', ondelete="SET NULL"), nullable=False)
+    # Also bumped when membership changes
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    manager_id = Column(Integer, ForeignKey('users.id', ondelete="SET NULL"), nullable=False, index=True)
+    # Counted from the team_members primary key; only loaded when asked for
+    member_count = column_property(
+        select(func.count()).where(team_members.c.team_id == id).scalar_subquery(),
+        deferred=True
+    )
 
     # Relationships
-    members = relationship("User", secondary=team_members, back_populates="teams")
+    members = relationship("User", secondary=team_members, back_populates="teams", order_by="User.id")
     projects = relationship("Project", back_populates="team", cascade="all, delete-orphan")
     manager = relationship("User", foreign_keys=[manager_id], back_populates="managed_teams") 
\ No newline at end of file
@@ -0,0 +1,75 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+# Polled lists: clients may keep a copy but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson. Datetimes and enums are written
+    natively, in the same format pydantic uses (UTC as Z). For strings,
+    integers, booleans, None and most floats the output is byte-for-byte
+    what JSONResponse writes. It is not identical everywhere: float exponents
+    may be spelled differently (1e-7 for 1e-07), NaN and Infinity become
+    null where JSONResponse raises, and integers beyond 64 bits raise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+@lru_cache(maxsize=None)
+def type_adapter(tp) -> TypeAdapter:
+    """One TypeAdapter per response type, so its validator and serializer are built once"""
+    return TypeAdapter(tp)
+
+def model_response(
+    tp,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+    include=None,
+    exclude=None
+) -> Response:
+    """
+    Validate content (ORM objects included) as tp and encode it in one pass
+    in pydantic-core, instead of FastAPI's validate, jsonable_encoder and
+    json.dumps round trip. The bytes are the same as the response_model path.
+    """
+    adapter = type_adapter(tp)
+    body = adapter.dump_json(
+        adapter.validate_python(content, from_attributes=True),
+        include=include,
+        exclude=exclude,
+    )
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+def weak_etag(request: Request, *validator) -> str:
+    """
+    Weak ETag from a validator tuple (e.g. a list watermark), the path and
+    the query string, so each page, filter and field selection has its own.
+    """
+    key = repr((request.url.path, sorted(request.query_params.multi_items()), validator))
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match comparison, which is always weak"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def set_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -6,6 +6,7 @@ from .tasks import router as tasks
 from .notifications import router as notifications
 from .reports import router as reports
 from .logs import router as logs
+from .metrics import router as metrics
 
 __all__ = [
     "auth",
@@ -16,4 +17,5 @@ __all__ = [
     "notifications",
     "reports",
     "logs",
+    "metrics",
 ] 
\ No newline at end of file
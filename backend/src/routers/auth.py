@@ -1,15 +1,29 @@
+import jwt
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from src.database.config import get_db
 from src.models.user import User
-from src.schemas.user import UserCreate, UserResponse, Token
-from src.auth.utils import verify_password, create_access_token, get_password_hash
-from src.auth.deps import get_current_user
+from src.schemas.user import UserCreate, UserResponse, Token, RefreshTokenRequest
+from src.auth.utils import create_access_token, SECRET_KEY, ALGORITHM
+from src.auth.hashing import password_hasher, HashQueueFull, HASH_RETRY_AFTER
+from src.auth.refresh import issue_refresh_token, rotate_refresh_token, revoke_refresh_token, RefreshTokenError
+from src.auth.deps import get_current_user, optional_oauth2_scheme
+from src.auth.revocation import revocation_list
+from src.search import user_directory
 
 router = APIRouter()
 
+def hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, try again shortly",
+        headers={"Retry-After": str(HASH_RETRY_AFTER)},
+    )
+
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
@@ -25,17 +39,31 @@ async def register(
             )
         
         # Create new user
+        try:
+            hashed_password = await password_hasher.hash(user_data.password)
+        except HashQueueFull:
+            raise hashing_unavailable()
+
         user = User(
             email=user_data.email,
             full_name=user_data.full_name,
-            hashed_password=get_password_hash(user_data.password)
+            hashed_password=hashed_password
         )
         
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        user_directory.invalidate()
         return user
         
+    except HTTPException as e:
+        await db.rollback()
+        if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -55,7 +83,12 @@ async def login(
     user = result.scalar_one_or_none()
     
     # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    try:
+        password_ok = bool(user) and await password_hasher.verify(form_data.password, user.hashed_password)
+    except HashQueueFull:
+        raise hashing_unavailable()
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -69,24 +102,64 @@ async def login(
             detail="Inactive user"
         )
     
-    # Create access token
+    # Create access token, plus a refresh token so clients can renew it
+    # without sending credentials (and paying for bcrypt) again
     access_token = create_access_token(
         data={"sub": user.email}
     )
+    refresh_token = await issue_refresh_token(db, user.id)
+    await db.commit()
     
     return {
         "access_token": access_token,
-        "token_type": "bearer"
+        "token_type": "bearer",
+        "refresh_token": refresh_token
     }
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    token_data: Optional[RefreshTokenRequest] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    # Revoke the presented access token until it would have expired anyway
+    if token:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.InvalidTokenError:
+            payload = {}
+        if payload.get("jti") and payload.get("exp"):
+            await revocation_list.revoke(
+                db, payload["jti"], datetime.utcfromtimestamp(payload["exp"])
+            )
+
+    # Revoke the refresh token family so the session cannot be renewed
+    if token_data is not None:
+        await revoke_refresh_token(db, token_data.refresh_token)
+
+    await db.commit()
     return {"message": "Successfully logged out"}
 
 @router.post("/refresh-token", response_model=Token)
-async def refresh_token(db: AsyncSession = Depends(get_db)):
-    # Implementation here
-    pass
+async def refresh_token(
+    token_data: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        email, new_refresh_token = await rotate_refresh_token(db, token_data.refresh_token)
+    except RefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    await db.commit()
+
+    return {
+        "access_token": create_access_token(data={"sub": email}),
+        "token_type": "bearer",
+        "refresh_token": new_refresh_token
+    }
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: User = Depends(get_current_user)):
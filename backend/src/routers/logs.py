@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
-from src.database.config import get_db
+from src.database.config import get_db, get_read_db
 from src.models.task import Task
 from src.models.comment import Comment
 from src.models.user import User
@@ -14,7 +14,7 @@ router = APIRouter()
 @router.get("/{task_id}/logs")
 async def get_task_logs(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     task = await db.get(Task, task_id)
@@ -34,7 +34,7 @@ async def get_task_logs(
 @router.get("/{task_id}/comments", response_model=List[CommentResponse])
 async def get_task_comments(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
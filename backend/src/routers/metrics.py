@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from src.database.config import engine, replica_engine
+from src.database.pool import pool_status
+from src.auth.cache import principal_cache
+from src.auth.hashing import password_hasher
+from src.auth.revocation import revocation_list
+from src.auth.deps import get_current_admin
+
+# Operational internals (pool load, cache and filter sizes): admins only
+router = APIRouter(dependencies=[Depends(get_current_admin)])
+
+@router.get("/db")
+async def get_db_metrics():
+    """Connection pool occupancy and checkout wait times"""
+    metrics = {"primary": pool_status(engine.pool)}
+    if replica_engine is not None:
+        metrics["replica"] = pool_status(replica_engine.pool)
+    return metrics
+
+@router.get("/auth")
+async def get_auth_metrics():
+    """Principal cache effectiveness and password hashing queue"""
+    return {
+        "principal_cache": principal_cache.snapshot(),
+        "password_hasher": password_hasher.snapshot(),
+        "revocation_list": revocation_list.snapshot(),
+    }
@@ -1,24 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
-from src.database.config import get_db
+from src.database.config import get_db, get_read_db
 from src.models.notification import Notification
 from src.models.user import User
 from src.schemas.notification import NotificationResponse
+from src.schemas.projection import notification_projection
 from src.auth.deps import get_current_user
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
-        select(Notification).where(Notification.user_id == current_user.id)
+        notification_projection.select().where(Notification.user_id == current_user.id)
     )
-    return result.scalars().all()
+    return notification_projection.render(result.all())
 
 @router.post("/mark-read")
 async def mark_notification_read(
@@ -1,17 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload, joinedload
-from typing import List
-from src.database.config import get_db
+from typing import List, Optional
+from src.database.config import get_db, get_read_db
+from src.database.loader import Loaders, get_loaders
+from src.database.pagination import encode_cursor, keyset_after, InvalidCursor
+from src.database.watermark import digest, fetch_watermark, touch
 from src.models.project import Project
 from src.models.team import Team
 from src.models.user import User
-from src.models.task import Task
+from src.models.task import Task, TaskStatus, TaskPriority
 from src.models.comment import Comment
-from src.schemas.project import ProjectCreate, ProjectResponse
+from src.schemas.project import ProjectCreate, ProjectResponse, ProjectSummary
 from src.schemas.comment import CommentCreate, CommentResponse
+from src.schemas.expand import Selection, project_selection
+from src.schemas.projection import project_projection, task_projection
+from src.schemas.sql_json import project_document
 from src.auth.deps import get_current_user
+from src.auth.access import AccessScope, get_access_scope, project_access_clause, task_project_access_clause, refresh_project_access
+from src.responses import FastJSONResponse, model_response, weak_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter(
     prefix="/projects",
@@ -43,6 +53,8 @@ async def create_project(
         )
         
         db.add(project)
+        await db.flush()
+        await refresh_project_access(db, project_ids=[project.id])
         await db.commit()
         await db.refresh(project)
 
@@ -64,47 +76,110 @@ async def create_project(
 
 @router.get("/", response_model=List[ProjectResponse])
 async def get_projects(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    selection: Selection = Depends(project_selection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get projects where:
     1. User is the project manager, OR
     2. Project belongs to a team where user is a member
+    ?fields= and ?include= (e.g. include=tasks,tasks.assignee) trim the response.
+    If-None-Match is answered with 304 before anything is loaded.
     """
     try:
-        # Get user's teams
-        teams_query = (
-            select(Team)
-            .join(Team.members)
-            .where(User.id == current_user.id)
-        )
-        teams_result = await db.execute(teams_query)
-        user_teams = teams_result.scalars().all()
-        team_ids = [team.id for team in user_teams]
+        # The projects, their tasks and their teams are all embedded; a
+        # project's version moves with every write to its tasks
+        visible = project_access_clause(current_user.id)
+        etag = weak_etag(request, *await fetch_watermark(
+            db,
+            select(digest(Project.id, Project.version, Project.updated_at)).where(visible),
+            select(digest(Team.id, Team.updated_at)).where(Team.id.in_(select(Project.team_id).where(visible))),
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        if selection.flat:
+            # Plain rows straight to the serializer, no ORM instances
+            result = await db.execute(
+                project_projection.select(selection.fields)
+                .where(project_access_clause(current_user.id))
+            )
+            return set_etag(project_projection.render(result.all(), selection.fields), etag)
 
-        # Get projects with all relationships loaded
+        # Get projects with the requested relationships loaded
         query = (
             select(Project)
-            .distinct()
-            .options(
-                selectinload(Project.team).selectinload(Team.members),
-                selectinload(Project.manager),
-                selectinload(Project.tasks).options(
-                    selectinload(Task.assignee),
-                    selectinload(Task.comments).selectinload(Comment.user)
-                )
-            )
-            .where(
-                or_(
-                    Project.manager_id == current_user.id,
-                    Project.team_id.in_(team_ids)
-                )
-            )
+            .options(*selection.options())
+            .where(project_access_clause(current_user.id))
         )
         
         result = await db.execute(query)
-        return result.unique().scalars().all()
+        return set_etag(selection.render(result.scalars().all()), etag)
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/summary", response_model=List[ProjectSummary])
+async def get_project_summaries(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    One row per accessible project with task counts by status and priority,
+    overdue tasks and last activity, from a single GROUP BY. For list pages
+    that do not need the tasks themselves.
+    """
+    try:
+        status_counts = {
+            status.value: func.count(Task.id).filter(Task.status == status).label(f"status_{status.value}")
+            for status in TaskStatus
+        }
+        priority_counts = {
+            priority.value: func.count(Task.id).filter(Task.priority == priority).label(f"priority_{priority.value}")
+            for priority in TaskPriority
+        }
+        query = (
+            select(
+                Project.id,
+                Project.name,
+                Project.manager_id,
+                User.full_name.label("manager_name"),
+                Project.team_id,
+                func.count(Task.id).label("task_count"),
+                *status_counts.values(),
+                *priority_counts.values(),
+                func.count(Task.id).filter(
+                    Task.due_date < func.now(), Task.status != TaskStatus.DONE
+                ).label("overdue"),
+                func.greatest(Project.updated_at, func.max(Task.updated_at)).label("last_activity"),
+            )
+            .outerjoin(User, User.id == Project.manager_id)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .where(project_access_clause(current_user.id))
+            .group_by(Project.id, User.full_name)
+            .order_by(Project.id)
+        )
+        result = await db.execute(query)
+
+        summaries = []
+        for row in result:
+            done = row._mapping[status_counts[TaskStatus.DONE.value].name]
+            summaries.append({
+                "id": row.id,
+                "name": row.name,
+                "manager_id": row.manager_id,
+                "manager_name": row.manager_name,
+                "team_id": row.team_id,
+                "task_count": row.task_count,
+                "by_status": {key: row._mapping[column.name] for key, column in status_counts.items()},
+                "by_priority": {key: row._mapping[column.name] for key, column in priority_counts.items()},
+                "overdue": row.overdue,
+                "progress": done / row.task_count if row.task_count else 0,
+                "last_activity": row.last_activity,
+            })
+        return model_response(List[ProjectSummary], summaries)
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -112,43 +187,37 @@ async def get_projects(
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    selection: Selection = Depends(project_selection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get a specific project if the user has access to it"""
+    """
+    Get a specific project if the user has access to it. The full document
+    is rendered as JSON by PostgreSQL and sent as is.
+    """
     try:
-        # First get user's teams
-        teams_query = (
-            select(Team)
-            .join(Team.members)
-            .where(User.id == current_user.id)
-        )
-        teams_result = await db.execute(teams_query)
-        user_teams = teams_result.scalars().all()
-        team_ids = [team.id for team in user_teams]
+        if selection.is_default and db.bind.dialect.name == "postgresql":
+            document = await db.scalar(
+                project_document(Project.id == project_id, project_access_clause(current_user.id))
+            )
+            if document is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Project not found or you don't have access to it"
+                )
+            return Response(document.encode(), media_type="application/json")
 
         query = (
             select(Project)
-            .distinct()
-            .options(
-                selectinload(Project.team).selectinload(Team.members),
-                selectinload(Project.manager),
-                selectinload(Project.tasks).options(
-                    selectinload(Task.assignee),
-                    selectinload(Task.comments).selectinload(Comment.user)
-                )
-            )
+            .options(*selection.options())
             .where(
                 Project.id == project_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Project.team_id.in_(team_ids)
-                )
+                project_access_clause(current_user.id)
             )
         )
         
         result = await db.execute(query)
-        project = result.unique().scalar_one_or_none()
+        project = result.scalar_one_or_none()
         
         if not project:
             raise HTTPException(
@@ -156,20 +225,92 @@ async def get_project(
                 detail="Project not found or you don't have access to it"
             )
             
-        return project
+        return selection.render(project)
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/{project_id}/board")
+async def get_project_board(
+    project_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[TaskStatus] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    access: AccessScope = Depends(get_access_scope)
+):
+    """
+    Kanban board: the newest `limit` tasks of each status column with the
+    column's total, from one window-function query. Pass status and that
+    column's next_cursor to page a single column.
+    """
+    project_access = await access.project_access(db, project_id)
+    if project_access is None:
+        raise HTTPException(status_code=404, detail=f"Project with id {project_id} not found")
+    if not project_access:
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    if cursor and status is None:
+        raise HTTPException(status_code=400, detail="cursor pages one column; pass its status too")
+
+    column_order = (Task.created_at.desc(), Task.id.desc())
+    ranked = (
+        task_projection.select(
+            None,
+            Task.status.label("board_status"),
+            func.row_number().over(partition_by=Task.status, order_by=column_order).label("position"),
+            func.count().over(partition_by=Task.status).label("total"),
+            Task.created_at.label("sort_created_at"),
+            Task.id.label("sort_id"),
+        )
+        .where(Task.project_id == project_id)
+    )
+    if status is not None:
+        ranked = ranked.where(Task.status == status)
+    ranked = ranked.subquery()
+
+    # Positions and totals cover the whole column, so paging filters outside
+    # the window; one row past the page tells whether there is another
+    query = select(ranked).order_by(ranked.c.board_status, ranked.c.position)
+    if status is None:
+        query = query.where(ranked.c.position <= limit + 1)
+    else:
+        try:
+            after = keyset_after([ranked.c.sort_created_at, ranked.c.sort_id], cursor, (datetime, int))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if after is not None:
+            query = query.where(after)
+        query = query.limit(limit + 1)
+    result = await db.execute(query)
+
+    serialize = task_projection.serializer()
+    columns = {
+        column: {"status": column, "total": 0, "tasks": [], "next_cursor": None}
+        for column in ([status] if status is not None else TaskStatus)
+    }
+    last_keys = {}
+    for row in result:
+        column = columns[row.board_status]
+        column["total"] = row.total
+        if len(column["tasks"]) == limit:
+            column["next_cursor"] = encode_cursor(last_keys[row.board_status])
+            continue
+        column["tasks"].append(serialize(row))
+        last_keys[row.board_status] = (row.sort_created_at, row.sort_id)
+
+    return FastJSONResponse(content={"project_id": project_id, "columns": list(columns.values())})
+
 @router.post("/{project_id}/assign/{user_id}")
 async def assign_user_to_project(
     project_id: int,
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
-    # Get project and verify current user is manager
-    project = await db.get(Project, project_id)
+    # Get project and user together, then verify current user is manager
+    project, user = await asyncio.gather(loaders.project(project_id), loaders.user(user_id))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -179,7 +320,6 @@ async def assign_user_to_project(
             detail="Only project manager can assign users"
         )
     
-    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -200,16 +340,11 @@ async def create_comment(
     try:
         # First verify task exists and belongs to the project
         task_query = (
-            select(Task)
-            .join(Project)  # Join with Project
-            .outerjoin(Team, Project.team_id == Team.id)  # Optional join with Team
+            select(Task.id)
             .where(
                 Task.id == task_id,
                 Task.project_id == project_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(id=current_user.id)
-                )
+                task_project_access_clause(current_user.id)
             )
         )
         task = await db.execute(task_query)
@@ -227,6 +362,8 @@ async def create_comment(
         )
         
         db.add(comment)
+        # Comments are embedded in the task, so they count as a task change
+        await db.execute(touch(Task, task_id))
         await db.commit()
         await db.refresh(comment)
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List
-from src.database.config import get_db
+from src.database.config import get_read_db
 from src.models.task import Task, TaskStatus
 from src.models.user import User
 from src.auth.deps import get_current_user
@@ -11,7 +11,7 @@ router = APIRouter()
 
 @router.get("/tasks-completed")
 async def get_tasks_completed(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     total_result = await db.execute(select(func.count(Task.id)))
@@ -30,7 +30,7 @@ async def get_tasks_completed(
 @router.get("/user-performance/{user_id}")
 async def get_user_performance(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     tasks_result = await db.execute(
@@ -55,7 +55,7 @@ async def get_user_performance(
 @router.get("/project-progress/{project_id}")
 async def get_project_progress(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     total_result = await db.execute(
@@ -1,20 +1,37 @@
+import asyncio
+import csv
+import io
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from enum import Enum
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, desc
+from sqlalchemy import select, insert, update, desc
+from pydantic import ValidationError
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 import traceback
-from src.database.config import get_db
+from src.database.config import get_db, get_read_db, read_session_factory
+from src.database.loader import Loaders, get_loaders
+from src.database.pagination import encode_cursor, decode_cursor, keyset_after, InvalidCursor
+from src.database.watermark import digest, fetch_watermark, touch
 from src.models.task import Task, TaskPriority, TaskStatus
 from src.models.project import Project
-from src.models.team import Team
 from src.models.user import User
 from src.models.comment import Comment
-from src.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from src.schemas.task import (
+    TaskCreate, TaskResponse, TaskUpdate, TaskFilter,
+    TaskBulkCreate, TaskBulkStatus, TaskBulkAssign
+)
 from src.schemas.comment import CommentCreate, CommentResponse
+from src.schemas.expand import Selection, task_selection
+from src.schemas.projection import task_projection, task_export_projection
 from src.auth.deps import get_current_user
+from src.responses import FastJSONResponse, model_response, weak_etag, etag_matches, not_modified, set_etag
+from src.auth.access import AccessScope, get_access_scope, task_access_clause, task_project_ids
+from src.search import search_tasks
 
 # Configure logging with more detail
 logger = logging.getLogger(__name__)
@@ -25,49 +42,51 @@ router = APIRouter(
     tags=["tasks"]
 )
 
+MAX_PAGE_SIZE = 500
+
+def task_filter_clauses(filters: TaskFilter) -> list:
+    """WHERE clauses for the filters that were provided"""
+    clauses = []
+    if filters.status is not None:
+        clauses.append(Task.status == filters.status)
+    if filters.priority is not None:
+        clauses.append(Task.priority == filters.priority)
+    if filters.project_id is not None:
+        clauses.append(Task.project_id == filters.project_id)
+    if filters.assignee is not None:
+        clauses.append(Task.assigned_to == filters.assignee)
+    if filters.due_after is not None:
+        clauses.append(Task.due_date >= filters.due_after)
+    if filters.due_before is not None:
+        clauses.append(Task.due_date < filters.due_before)
+    return clauses
+
 @router.post("/", response_model=TaskResponse)
 async def create_task(
     task_data: TaskCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    access: AccessScope = Depends(get_access_scope),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create a new task"""
     try:
         logger.info(f"User {current_user.id} attempting to create task. URL: {request.url}")
         logger.debug(f"Task data: {task_data.model_dump()}")
 
-        # First check if project exists
-        project_query = (
-            select(Project)
-            .options(
-                selectinload(Project.team).selectinload(Team.members)
-            )
-            .where(Project.id == task_data.project_id)
-        )
-        logger.debug(f"Project query: {project_query}")
-        
-        project_result = await db.execute(project_query)
-        project = project_result.scalar_one_or_none()
+        # Check that the project exists and the user can access it
+        project_access = await access.project_access(db, task_data.project_id)
 
-        if not project:
+        if project_access is None:
             logger.warning(f"Project {task_data.project_id} not found")
             raise HTTPException(
                 status_code=404,
                 detail=f"Project with id {task_data.project_id} not found"
             )
 
-        # Check if user has access to the project
-        team_members = [member.id for member in project.team.members] if project.team else []
-        has_access = (
-            project.manager_id == current_user.id or
-            current_user.id in team_members
-        )
-
-        logger.debug(f"Access check - Manager ID: {project.manager_id}, Current User: {current_user.id}, Team Members: {team_members}")
-
-        if not has_access:
-            logger.warning(f"User {current_user.id} denied access to project {project.id}")
+        if not project_access:
+            logger.warning(f"User {current_user.id} denied access to project {task_data.project_id}")
             raise HTTPException(
                 status_code=403,
                 detail="You don't have access to this project"
@@ -75,7 +94,7 @@ async def create_task(
 
         # Verify assignee exists if provided
         if task_data.assigned_to:
-            assignee = await db.get(User, task_data.assigned_to)
+            assignee = await loaders.user(task_data.assigned_to)
             if not assignee:
                 logger.warning(f"Assignee {task_data.assigned_to} not found")
                 raise HTTPException(
@@ -133,53 +152,231 @@ async def create_task(
             }
         )
 
+# Rows per INSERT statement: 8 columns each stays under PostgreSQL's
+# 32767 bind parameter limit
+BULK_INSERT_PAGE_SIZE = 4000
+
+@router.post("/bulk")
+async def create_tasks_bulk(
+    payload: TaskBulkCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    access: AccessScope = Depends(get_access_scope)
+):
+    """
+    Create many tasks at once. Access is checked once per distinct project
+    and assignees in one query, then every valid item is inserted in one
+    multi-row INSERT ... RETURNING. Invalid items are reported by index in
+    errors and do not stop the rest.
+    """
+    try:
+        logger.info(f"User {current_user.id} bulk creating {len(payload.tasks)} tasks. URL: {request.url}")
+
+        errors = []
+        items = []
+        for index, raw in enumerate(payload.tasks):
+            try:
+                items.append((index, TaskCreate.model_validate(raw)))
+            except ValidationError as e:
+                errors.append({"index": index, "detail": e.errors(include_url=False, include_context=False)})
+
+        projects = await access.projects_access(db, {item.project_id for _, item in items})
+        assignee_ids = {item.assigned_to for _, item in items if item.assigned_to}
+        existing_users = set()
+        if assignee_ids:
+            result = await db.execute(select(User.id).where(User.id.in_(assignee_ids)))
+            existing_users = set(result.scalars().all())
+
+        rows = []
+        for index, item in items:
+            if projects[item.project_id] is None:
+                errors.append({"index": index, "detail": f"Project with id {item.project_id} not found"})
+            elif not projects[item.project_id]:
+                errors.append({"index": index, "detail": "You don't have access to this project"})
+            elif item.assigned_to and item.assigned_to not in existing_users:
+                errors.append({"index": index, "detail": f"User with id {item.assigned_to} not found"})
+            else:
+                rows.append(item.model_dump())
+
+        created = []
+        if rows:
+            result = await db.execute(
+                insert(Task)
+                .returning(*task_projection.select().selected_columns, sort_by_parameter_order=True)
+                .execution_options(insertmanyvalues_page_size=BULK_INSERT_PAGE_SIZE),
+                rows
+            )
+            created = task_projection.dump(result.all())
+            await db.commit()
+
+        errors.sort(key=lambda error: error["index"])
+        logger.info(f"Bulk created {len(created)} tasks, {len(errors)} rejected")
+        return FastJSONResponse(content={"created": created, "errors": errors})
+
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error bulk creating tasks: {type(e).__name__}: {e}\n{traceback.format_exc()}")
+        raise HTTPException(
+            status_code=400,
+            detail={
+                'message': 'Error creating tasks',
+                'error': str(e),
+                'error_type': type(e).__name__
+            }
+        )
+
+async def bulk_update(db: AsyncSession, user_id: int, target, values: dict, returning) -> list:
+    """
+    One access-filtered UPDATE ... RETURNING over the target tasks. Rows that
+    already hold the new values are left alone, so only changes come back.
+    """
+    clauses = [task_access_clause(user_id)]
+    if target.ids is not None:
+        clauses.append(Task.id.in_(target.ids))
+    else:
+        clauses.extend(task_filter_clauses(target.filters))
+    clauses.extend(getattr(Task, key).is_distinct_from(value) for key, value in values.items())
+
+    result = await db.execute(
+        update(Task)
+        .where(*clauses)
+        .values(**values)
+        .returning(Task.id, *returning)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    await db.commit()
+    return [dict(row._mapping) for row in rows]
+
+@router.patch("/status")
+async def update_tasks_status(
+    payload: TaskBulkStatus,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Set the status of every accessible task in ids or matching filters"""
+    try:
+        updated = await bulk_update(
+            db, current_user.id, payload, {"status": payload.status}, [Task.status]
+        )
+        logger.info(f"User {current_user.id} set {len(updated)} tasks to {payload.status.value}")
+        return FastJSONResponse(content={"updated": updated})
+
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error updating task statuses: {type(e).__name__}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/assign")
+async def assign_tasks(
+    payload: TaskBulkAssign,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
+):
+    """Assign (or with assigned_to null, unassign) every accessible task in ids or matching filters"""
+    try:
+        if payload.assigned_to is not None and not await loaders.user(payload.assigned_to):
+            raise HTTPException(
+                status_code=404,
+                detail=f"User with id {payload.assigned_to} not found"
+            )
+
+        updated = await bulk_update(
+            db, current_user.id, payload, {"assigned_to": payload.assigned_to}, [Task.assigned_to]
+        )
+        logger.info(f"User {current_user.id} assigned {len(updated)} tasks to {payload.assigned_to}")
+        return FastJSONResponse(content={"updated": updated})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error assigning tasks: {type(e).__name__}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=List[TaskResponse])
 async def get_tasks(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    filters: TaskFilter = Depends(),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    selection: Selection = Depends(task_selection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all tasks the user has access to"""
+    """
+    Get tasks the user has access to, newest first, one page at a time.
+    When more tasks follow, the X-Next-Cursor header holds the cursor for
+    the next page. ?fields= and ?include= trim the response. The ETag
+    covers every matching task, so If-None-Match skips the query when
+    nothing changed.
+    """
     try:
         logger.info(f"User {current_user.id} requesting tasks. URL: {request.url}")
-        
-        # Get tasks with all relationships loaded
+
+        try:
+            after = keyset_after([Task.created_at, Task.id], cursor, (datetime, int))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Cheap validator first: the version of every project holding a
+        # visible task, so an unchanged list is answered with 304 without
+        # reading any task
+        etag = weak_etag(request, *await fetch_watermark(
+            db,
+            select(digest(Project.id, Project.version))
+            .where(Project.id.in_(task_project_ids(current_user.id)))
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        if selection.flat:
+            # Plain rows, with the sort key appended for the cursor
+            query = task_projection.select(selection.fields, Task.created_at, Task.id)
+        else:
+            # Get tasks with the requested relationships loaded
+            query = select(Task).options(*selection.options())
         query = (
-            select(Task)
-            .distinct()
-            .options(
-                selectinload(Task.assignee),
-                selectinload(Task.comments).options(
-                    selectinload(Comment.user)
-                ),
-                selectinload(Task.project).options(
-                    selectinload(Project.team).selectinload(Team.members)
-                )
-            )
-            .join(Project)
-            .outerjoin(Team, Project.team_id == Team.id)
-            .where(
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(User.id == current_user.id),
-                    Task.assigned_to == current_user.id
-                )
-            )
-            .order_by(Task.created_at.desc())
+            query
+            .where(task_access_clause(current_user.id), *task_filter_clauses(filters))
+            .order_by(Task.created_at.desc(), Task.id.desc())
+            .limit(limit + 1)
         )
+        if after is not None:
+            query = query.where(after)
         
         logger.debug(f"Executing query: {query}")
         result = await db.execute(query)
-        tasks = result.unique().scalars().all()
+        tasks = result.all() if selection.flat else result.scalars().all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            last = tasks[-1]
+            key = [last[-2], last[-1]] if selection.flat else [last.created_at, last.id]
+            next_cursor = encode_cursor(key)
         
         logger.info(f"Found {len(tasks)} tasks for user {current_user.id}")
         
         if not tasks:
             logger.warning(f"No tasks found for user {current_user.id}")
-            return []
-            
-        return tasks
 
+        if selection.flat:
+            rendered = task_projection.render(tasks, selection.fields)
+        else:
+            rendered = selection.render(tasks)
+
+        if next_cursor is not None:
+            # A returned Response replaces the injected one, so it carries the header
+            target = rendered if isinstance(rendered, Response) else response
+            target.headers["X-Next-Cursor"] = next_cursor
+        return set_etag(rendered, etag)
+
+    except HTTPException:
+        raise
     except Exception as e:
         error_details = {
             'error_type': type(e).__name__,
@@ -199,11 +396,121 @@ async def get_tasks(
             }
         )
 
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_BATCH_SIZE = 1000
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # Same text as the JSON responses
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z).decode().strip('"')
+    return value
+
+def encode_ndjson(records) -> bytes:
+    return b"".join(orjson.dumps(record, option=orjson.OPT_UTC_Z) + b"\n" for record in records)
+
+def encode_csv(records) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in record.values()] for record in records)
+    return buffer.getvalue().encode()
+
+async def stream_export(session_factory, query, format: str):
+    """
+    Rows from a server-side cursor, encoded one batch at a time. The export
+    has its own session because the response outlives the request's
+    dependencies.
+    """
+    serialize = task_export_projection.serializer()
+    encode = encode_ndjson if format == "ndjson" else encode_csv
+    if format == "csv":
+        yield encode_csv([dict(zip(task_export_projection.fields, task_export_projection.fields))])
+    async with session_factory() as session:
+        try:
+            result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                yield encode([serialize(row) for row in rows])
+        except Exception as e:
+            # Headers are already sent, so the truncated body is all the client sees
+            logger.error(f"Error streaming task export: {type(e).__name__}: {e}")
+            raise
+
+@router.get("/export")
+async def export_tasks(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    team_id: Optional[int] = None,
+    filters: TaskFilter = Depends(),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream every accessible task matching the filters as NDJSON or CSV.
+    team_id narrows to the team's projects. Memory use does not grow with
+    the number of tasks.
+    """
+    logger.info(f"User {current_user.id} exporting tasks as {format}. URL: {request.url}")
+
+    query = (
+        task_export_projection.select()
+        .where(task_access_clause(current_user.id), *task_filter_clauses(filters))
+        .order_by(Task.created_at, Task.id)
+    )
+    if team_id is not None:
+        query = query.where(Task.project_id.in_(select(Project.id).where(Project.team_id == team_id)))
+
+    return StreamingResponse(
+        stream_export(read_session_factory(request), query, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
+
+@router.get("/search")
+async def search_tasks_endpoint(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Full-text search over accessible tasks' titles, descriptions and
+    comments (web search syntax: quoted phrases, OR, -word). Results are
+    flat task rows with a rank, best first; X-Next-Cursor pages on.
+    """
+    try:
+        try:
+            after = decode_cursor(cursor, (float, int)) if cursor else None
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        rows = await search_tasks(db, current_user.id, q, limit + 1, after)
+        serialize = task_projection.serializer()
+        results = [{**serialize(row), "rank": row[-1]} for row in rows[:limit]]
+
+        response = FastJSONResponse(content=results)
+        if len(rows) > limit:
+            last = results[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor([last["rank"], last["id"]])
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching tasks: {type(e).__name__}: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    selection: Selection = Depends(task_selection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific task if the user has access to it"""
@@ -212,30 +519,16 @@ async def get_task(
         
         query = (
             select(Task)
-            .options(
-                selectinload(Task.assignee),
-                selectinload(Task.comments).options(
-                    selectinload(Comment.user)
-                ),
-                selectinload(Task.project).options(
-                    selectinload(Project.team).selectinload(Team.members)
-                )
-            )
-            .join(Project)
-            .outerjoin(Team, Project.team_id == Team.id)
+            .options(*selection.options())
             .where(
                 Task.id == task_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(User.id == current_user.id),
-                    Task.assigned_to == current_user.id
-                )
+                task_access_clause(current_user.id)
             )
         )
         
         logger.debug(f"Executing query: {query}")
         result = await db.execute(query)
-        task = result.unique().scalar_one_or_none()
+        task = result.scalar_one_or_none()
         
         if not task:
             logger.warning(f"Task {task_id} not found or user {current_user.id} doesn't have access")
@@ -245,7 +538,7 @@ async def get_task(
             )
         
         logger.info(f"Successfully retrieved task {task_id} for user {current_user.id}")
-        return task
+        return selection.render(task)
 
     except HTTPException as e:
         raise e
@@ -274,13 +567,13 @@ async def assign_task(
     task_id: int,
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
-    task = await db.get(Task, task_id)
+    task, user = await asyncio.gather(loaders.task(task_id), loaders.user(user_id))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -294,15 +587,14 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Update task by anyone who has access to it"""
     try:
         # Get task with relationships and verify access
         query = (
             select(Task)
-            .join(Project)
-            .outerjoin(Team, Project.team_id == Team.id)
             .options(
                 selectinload(Task.project),
                 selectinload(Task.assignee),
@@ -312,11 +604,7 @@ async def update_task(
             )
             .where(
                 Task.id == task_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(id=current_user.id),
-                    Task.assigned_to == current_user.id
-                )
+                task_access_clause(current_user.id)
             )
         )
         
@@ -331,7 +619,7 @@ async def update_task(
 
         # Verify new assignee exists if provided
         if task_update.assigned_to is not None:
-            assignee = await db.get(User, task_update.assigned_to)
+            assignee = await loaders.user(task_update.assigned_to)
             if not assignee:
                 raise HTTPException(
                     status_code=404,
@@ -367,8 +655,6 @@ async def update_task_status(
         # Get task with relationships and verify access
         query = (
             select(Task)
-            .join(Project)
-            .outerjoin(Team, Project.team_id == Team.id)
             .options(
                 selectinload(Task.project),
                 selectinload(Task.assignee),
@@ -376,11 +662,7 @@ async def update_task_status(
             )
             .where(
                 Task.id == task_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(id=current_user.id),
-                    Task.assigned_to == current_user.id
-                )
+                task_access_clause(current_user.id)
             )
         )
         
@@ -412,29 +694,13 @@ async def create_task_comment(
     task_id: int,
     text: str = Body(..., embed=True),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    access: AccessScope = Depends(get_access_scope)
 ):
     """Create a comment on a task"""
     try:
         # Verify task exists and user has access
-        query = (
-            select(Task)
-            .join(Project)
-            .outerjoin(Team, Project.team_id == Team.id)
-            .where(
-                Task.id == task_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(id=current_user.id),
-                    Task.assigned_to == current_user.id
-                )
-            )
-        )
-        
-        result = await db.execute(query)
-        task = result.scalar_one_or_none()
-        
-        if not task:
+        if not await access.can_view_task(db, task_id):
             raise HTTPException(
                 status_code=404,
                 detail="Task not found or you don't have access to it"
@@ -448,6 +714,8 @@ async def create_task_comment(
         )
         
         db.add(comment)
+        # Comments are embedded in the task, so they count as a task change
+        await db.execute(touch(Task, task_id))
         await db.commit()
         await db.refresh(comment)
 
@@ -466,28 +734,14 @@ async def create_task_comment(
 @router.get("/{task_id}/comments", response_model=List[CommentResponse])
 async def get_task_comments(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    access: AccessScope = Depends(get_access_scope)
 ):
     """Get all comments for a task"""
     try:
         # Verify task exists and user has access
-        task_query = (
-            select(Task)
-            .join(Project)
-            .outerjoin(Team, Project.team_id == Team.id)
-            .where(
-                Task.id == task_id,
-                or_(
-                    Project.manager_id == current_user.id,
-                    Team.members.any(id=current_user.id),
-                    Task.assigned_to == current_user.id
-                )
-            )
-        )
-        
-        task_result = await db.execute(task_query)
-        if not task_result.scalar_one_or_none():
+        if not await access.can_view_task(db, task_id):
             raise HTTPException(
                 status_code=404,
                 detail="Task not found or you don't have access to it"
@@ -502,7 +756,7 @@ async def get_task_comments(
         )
         
         result = await db.execute(query)
-        return result.scalars().all()
+        return model_response(List[CommentResponse], result.scalars().all())
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
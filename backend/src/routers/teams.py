@@ -1,16 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
-from typing import List
-from src.database.config import get_db
+from sqlalchemy import select, delete, func, literal, any_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.orm import selectinload, undefer
+from typing import List, Optional
+from src.database.config import get_db, get_read_db
+from src.database.loader import Loaders, get_loaders
+from src.database.pagination import encode_cursor, keyset_after, InvalidCursor
+from src.database.watermark import digest, fetch_watermark, touch
 from src.models.team import Team, team_members
-from src.models.user import User
-from src.schemas.team import TeamCreate, TeamResponse
+from src.models.user import User, UserRole
+from src.schemas.team import TeamCreate, TeamResponse, TeamListItem, TeamMembersBulk
+from src.schemas.expand import Selection, team_selection
+from src.schemas.projection import team_projection
 from src.auth.deps import get_current_user
+from src.auth.access import team_member_clause, refresh_project_access
+from src.responses import model_response, weak_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 200
+
+class TeamScope(str, Enum):
+    MINE = "mine"
+    ALL = "all"
+
 @router.post("/", response_model=TeamResponse)
 async def create_team(
     team_data: TeamCreate,
@@ -42,20 +57,69 @@ async def create_team(
         await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[TeamResponse])
+@router.get("/", response_model=List[TeamListItem])
 async def get_teams(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    scope: TeamScope = TeamScope.MINE,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    selection: Selection = Depends(team_selection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Team).options(selectinload(Team.members))
-    )
-    return result.scalars().all()
+    """
+    Teams the user belongs to or manages (scope=all lists every team, for
+    admins), newest first, one page at a time. member_count comes from the
+    membership index; ?include=members embeds the members themselves. When
+    more teams follow, the X-Next-Cursor header holds the cursor for the next
+    page.
+    """
+    if scope == TeamScope.ALL and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can list all teams")
+    try:
+        after = keyset_after([Team.id], cursor, (int,))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    visible = [] if scope == TeamScope.ALL else [team_member_clause(current_user.id)]
+    etag = weak_etag(request, *await fetch_watermark(
+        db, select(digest(Team.id, Team.updated_at)).where(*visible)
+    ))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    try:
+        if selection.flat:
+            # Plain rows, with the sort key appended for the cursor
+            query = team_projection.select(selection.fields, Team.id)
+        else:
+            query = select(Team).options(undefer(Team.member_count), *selection.options())
+        query = query.where(*visible).order_by(Team.id.desc()).limit(limit + 1)
+        if after is not None:
+            query = query.where(after)
+        result = await db.execute(query)
+        teams = result.all() if selection.flat else result.scalars().all()
+
+        next_cursor = None
+        if len(teams) > limit:
+            teams = teams[:limit]
+            next_cursor = encode_cursor([teams[-1][-1] if selection.flat else teams[-1].id])
+
+        if selection.flat:
+            rendered = team_projection.render(teams, selection.fields)
+        else:
+            rendered = selection.render(teams)
+        if next_cursor is not None:
+            rendered.headers["X-Next-Cursor"] = next_cursor
+        return set_etag(rendered, etag)
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{team_id}", response_model=TeamResponse)
 async def get_team(
     team_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
@@ -66,14 +130,15 @@ async def get_team(
     team = result.scalar_one_or_none()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    return team
+    return model_response(TeamResponse, team)
 
 @router.post("/{team_id}/members")
 async def add_team_member(
     team_id: int,
     user_id: int = Body(..., embed=True),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
     # Get team with members loaded
     result = await db.execute(
@@ -93,7 +158,7 @@ async def add_team_member(
         )
     
     # Get user to add
-    user = await db.get(User, user_id)
+    user = await loaders.user(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -105,6 +170,9 @@ async def add_team_member(
         )
     
     team.members.append(user)
+    await db.flush()
+    await refresh_project_access(db, user_ids=[user.id])
+    await db.execute(touch(Team, team_id))
     await db.commit()
     
     # Reload team with members
@@ -116,12 +184,82 @@ async def add_team_member(
     updated_team = result.scalar_one()
     return {"message": "Member added successfully", "team": updated_team}
 
+async def get_managed_team(db: AsyncSession, team_id: int, current_user: User) -> Team:
+    team = await db.get(Team, team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    if team.manager_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Only team manager can change members")
+    return team
+
+async def membership_changed(db: AsyncSession, team_id: int, user_ids: List[int]) -> None:
+    if user_ids:
+        await refresh_project_access(db, user_ids=user_ids)
+        await db.execute(touch(Team, team_id))
+    await db.commit()
+
+@router.post("/{team_id}/members/bulk")
+async def add_team_members(
+    team_id: int,
+    payload: TeamMembersBulk,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Add many users in one INSERT ... ON CONFLICT DO NOTHING. Only the users
+    actually added are returned; existing members and unknown ids are not.
+    """
+    await get_managed_team(db, team_id, current_user)
+    try:
+        result = await db.execute(
+            pg_insert(team_members)
+            .from_select(
+                ["team_id", "user_id"],
+                select(literal(team_id), User.id)
+                .where(User.id == any_(literal(payload.user_ids, ARRAY(Integer))))
+            )
+            .on_conflict_do_nothing()
+            .returning(team_members.c.user_id)
+        )
+        added = sorted(result.scalars().all())
+        await membership_changed(db, team_id, added)
+        return {"added": added}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/{team_id}/members/bulk")
+async def remove_team_members(
+    team_id: int,
+    payload: TeamMembersBulk,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Remove many users in one DELETE; only the users actually removed are returned"""
+    await get_managed_team(db, team_id, current_user)
+    try:
+        result = await db.execute(
+            delete(team_members)
+            .where(
+                team_members.c.team_id == team_id,
+                team_members.c.user_id == any_(literal(payload.user_ids, ARRAY(Integer))),
+            )
+            .returning(team_members.c.user_id)
+        )
+        removed = sorted(result.scalars().all())
+        await membership_changed(db, team_id, removed)
+        return {"removed": removed}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/{team_id}/members/{user_id}")
 async def add_team_member_by_path(
     team_id: int,
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
     # Get team with members loaded
     result = await db.execute(
@@ -141,7 +279,7 @@ async def add_team_member_by_path(
         )
     
     # Get user to add
-    user = await db.get(User, user_id)
+    user = await loaders.user(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -153,6 +291,9 @@ async def add_team_member_by_path(
         )
     
     team.members.append(user)
+    await db.flush()
+    await refresh_project_access(db, user_ids=[user.id])
+    await db.execute(touch(Team, team_id))
     await db.commit()
     
     # Reload team with members
@@ -171,15 +312,14 @@ async def remove_team_member(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    team = await db.get(Team, team_id)
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
-    
-    user = await db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    team.members.remove(user)
-    await db.commit()
-    return {"message": "Member removed successfully"} 
-    return {"message": "Member removed successfully"} 
\ No newline at end of file
+    await get_managed_team(db, team_id, current_user)
+
+    # One DELETE instead of loading team.members, which async sessions cannot lazy-load
+    result = await db.execute(
+        delete(team_members)
+        .where(team_members.c.team_id == team_id, team_members.c.user_id == user_id)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="User is not a member of this team")
+    await membership_changed(db, team_id, [user_id])
+    return {"message": "Member removed successfully"}
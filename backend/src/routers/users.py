@@ -1,36 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from src.database.config import get_db
+from sqlalchemy import select, update, union, func
+from src.database.config import get_db, get_read_db
+from src.database.watermark import bump
+from src.models.access import user_project_access
+from src.models.comment import Comment
+from src.models.project import Project
+from src.models.task import Task
+from src.models.team import Team, team_members
 from src.models.user import User
 from src.schemas.user import UserResponse
+from src.schemas.projection import user_projection
+from src.responses import FastJSONResponse, model_response
 from src.auth.deps import get_current_user
-from typing import List
+from src.auth.cache import principal_cache
+from src.auth.access import AccessScope, get_access_scope, team_member_clause
+from src.search import search_users, user_directory
+from typing import List, Optional
 
 router = APIRouter(
     prefix="",
     tags=["users"]
 )
 
+async def user_references_changed(db: AsyncSession, user_id: int) -> None:
+    """
+    Move the ETags of lists that embed the user: projects the user manages or
+    can see, projects with tasks assigned to or commented on by the user, and
+    teams the user is a member of.
+    """
+    await db.execute(bump(Project, Project.id.in_(union(
+        select(user_project_access.c.project_id).where(user_project_access.c.user_id == user_id),
+        select(Task.project_id).where(Task.assigned_to == user_id),
+        select(Task.project_id).join(Comment, Comment.task_id == Task.id).where(Comment.user_id == user_id),
+    ))))
+    await db.execute(
+        update(Team)
+        .where(Team.id.in_(select(team_members.c.team_id).where(team_members.c.user_id == user_id)))
+        .values(updated_at=func.now())
+    )
+
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(User))
-    return result.scalars().all()
+    result = await db.execute(user_projection.select())
+    return user_projection.render(result.all())
+
+@router.get("/search")
+async def search_users_endpoint(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    team_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    access: AccessScope = Depends(get_access_scope)
+):
+    """
+    Assignee autocomplete: active users whose name or email starts with q,
+    has a word starting with q, or is close to it (typos), best first.
+    team_id and project_id narrow it to the team's members or the users
+    with access to the project.
+    """
+    scope = None
+    if team_id is not None:
+        if await db.get(Team, team_id) is None:
+            raise HTTPException(status_code=404, detail="Team not found")
+        if await db.scalar(select(Team.id).where(Team.id == team_id, team_member_clause(current_user.id))) is None:
+            raise HTTPException(status_code=403, detail="You are not a member of this team")
+        scope = select(team_members.c.user_id).where(team_members.c.team_id == team_id)
+    if project_id is not None:
+        project_access = await access.project_access(db, project_id)
+        if project_access is None:
+            raise HTTPException(status_code=404, detail=f"Project with id {project_id} not found")
+        if not project_access:
+            raise HTTPException(status_code=403, detail="You don't have access to this project")
+        project_users = select(user_project_access.c.user_id).where(user_project_access.c.project_id == project_id)
+        scope = project_users if scope is None else scope.where(team_members.c.user_id.in_(project_users))
+
+    try:
+        rows = await search_users(db, q, limit, scope)
+        serialize = user_projection.serializer()
+        return FastJSONResponse(content=[{**serialize(row), "rank": row[-1]} for row in rows])
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return model_response(UserResponse, user)
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
@@ -50,8 +117,11 @@ async def update_user(
     for key, value in user_data.dict(exclude_unset=True).items():
         setattr(user, key, value)
     
+    await user_references_changed(db, user_id)
     await db.commit()
     await db.refresh(user)
+    principal_cache.invalidate_user(user_id)
+    user_directory.invalidate()
     return user
 
 @router.delete("/{user_id}")
@@ -68,6 +138,9 @@ async def delete_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    await user_references_changed(db, user_id)
     await db.delete(user)
     await db.commit()
+    principal_cache.invalidate_user(user_id)
+    user_directory.invalidate()
     return {"message": "User deleted successfully"} 
\ No newline at end of file
@@ -1,7 +1,10 @@
-from .user import UserCreate, UserResponse, Token, TokenData
-from .team import TeamCreate, TeamResponse
-from .project import ProjectCreate, ProjectResponse
-from .task import TaskCreate, TaskUpdate, TaskResponse
+from .user import UserCreate, UserResponse, Token, TokenData, RefreshTokenRequest
+from .team import TeamCreate, TeamResponse, TeamListItem, TeamMembersBulk
+from .project import ProjectCreate, ProjectResponse, ProjectSummary
+from .task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskFilter,
+    TaskBulkCreate, TaskBulkStatus, TaskBulkAssign
+)
 from .comment import CommentCreate, CommentResponse
 from .notification import NotificationCreate, NotificationResponse
 
@@ -10,13 +13,21 @@ __all__ = [
     "UserResponse",
     "Token",
     "TokenData",
+    "RefreshTokenRequest",
     "TeamCreate",
     "TeamResponse",
+    "TeamListItem",
+    "TeamMembersBulk",
     "ProjectCreate",
     "ProjectResponse",
+    "ProjectSummary",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
+    "TaskFilter",
+    "TaskBulkCreate",
+    "TaskBulkStatus",
+    "TaskBulkAssign",
     "CommentCreate",
     "CommentResponse",
     "NotificationCreate",
@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Type
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import selectinload, noload
+from src.responses import model_response
+from src.models.task import Task
+from src.models.comment import Comment
+from src.models.project import Project
+from src.models.team import Team
+from .task import TaskResponse
+from .project import ProjectResponse
+from .team import TeamListItem
+
+@dataclass
+class Expansion:
+    """A relationship that can be embedded in a response, and its own expansions"""
+    attribute: Any
+    children: Dict[str, "Expansion"] = field(default_factory=dict)
+
+    @property
+    def many(self) -> bool:
+        return self.attribute.property.uselist
+
+def _paths(tree: Dict[str, Expansion], prefix: str = "") -> Set[str]:
+    paths = set()
+    for name, expansion in tree.items():
+        paths.add(prefix + name)
+        paths |= _paths(expansion.children, prefix + name + ".")
+    return paths
+
+def _split(value: Optional[str]) -> Optional[Set[str]]:
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+class Selection:
+    """
+    Which fields and relationships a caller asked for. Relationships not
+    included are neither queried (noload) nor serialized.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        tree: Dict[str, Expansion],
+        fields: Optional[Set[str]],
+        include: Set[str],
+        is_default: bool
+    ):
+        self.model = model
+        self.tree = tree
+        self.fields = fields
+        self.include = include
+        self.is_default = is_default
+
+    @property
+    def flat(self) -> bool:
+        """No relationships requested, so the column projection can serve it"""
+        return not self.include
+
+    def options(self, tree: Optional[Dict[str, Expansion]] = None, prefix: str = "") -> list:
+        """Loader options for the selection, one per relationship in the tree"""
+        options = []
+        for name, expansion in (self.tree if tree is None else tree).items():
+            path = prefix + name
+            if path in self.include:
+                loader = selectinload(expansion.attribute)
+                children = self.options(expansion.children, path + ".")
+                options.append(loader.options(*children) if children else loader)
+            else:
+                options.append(noload(expansion.attribute))
+        return options
+
+    def _exclude(self, tree: Dict[str, Expansion], prefix: str = "") -> Dict[str, Any]:
+        exclude = {}
+        for name, expansion in tree.items():
+            path = prefix + name
+            if path not in self.include:
+                exclude[name] = True
+                continue
+            nested = self._exclude(expansion.children, path + ".")
+            if nested:
+                exclude[name] = {"__all__": nested} if expansion.many else nested
+        return exclude
+
+    def render(self, objs):
+        """The selected shape encoded straight from the ORM objects"""
+        many = isinstance(objs, list)
+        include = self.fields
+        exclude = self._exclude(self.tree) or None
+        if many:
+            include = None if include is None else {"__all__": include}
+            exclude = None if exclude is None else {"__all__": exclude}
+        return model_response(
+            List[self.model] if many else self.model,
+            objs,
+            include=include,
+            exclude=exclude,
+        )
+
+def selection_dependency(model: Type[BaseModel], tree: Dict[str, Expansion]):
+    """
+    FastAPI dependency parsing ?fields=a,b and ?include=rel,rel.child.
+    Without either parameter the full response is returned as before.
+    With fields only, the relationships named in it are included, each
+    with its default nested relationships.
+    """
+    known_fields = set(model.model_fields)
+    known_paths = _paths(tree)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated response fields"),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed")
+    ) -> Selection:
+        field_set = _split(fields)
+        include_set = _split(include)
+
+        if field_set is not None and field_set - known_fields:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(field_set - known_fields))}"
+            )
+        if include_set is not None and include_set - known_paths:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown include: {', '.join(sorted(include_set - known_paths))}"
+            )
+
+        if include_set is None:
+            # Without include, a relationship named in fields comes with the
+            # nested relationships it has in the default response
+            include_set = known_paths if field_set is None else {
+                path for path in known_paths if path.split(".")[0] in field_set
+            }
+        # A nested include implies its parents
+        for path in list(include_set):
+            parts = path.split(".")
+            include_set |= {".".join(parts[:i]) for i in range(1, len(parts))}
+        if field_set is not None:
+            include_set = {path for path in include_set if path.split(".")[0] in field_set}
+
+        return Selection(
+            model,
+            tree,
+            field_set,
+            include_set,
+            is_default=field_set is None and include_set == known_paths
+        )
+
+    return dependency
+
+# Embeddable relationships of TaskResponse, ProjectResponse and TeamListItem
+TASK_EXPANSIONS = {
+    "assignee": Expansion(Task.assignee),
+    "comments": Expansion(Task.comments, {"user": Expansion(Comment.user)}),
+}
+
+PROJECT_EXPANSIONS = {
+    "manager": Expansion(Project.manager),
+    "team": Expansion(Project.team, {"members": Expansion(Team.members)}),
+    "tasks": Expansion(Project.tasks, TASK_EXPANSIONS),
+}
+
+TEAM_EXPANSIONS = {
+    "members": Expansion(Team.members),
+}
+
+task_selection = selection_dependency(TaskResponse, TASK_EXPANSIONS)
+project_selection = selection_dependency(ProjectResponse, PROJECT_EXPANSIONS)
+team_selection = selection_dependency(TeamListItem, TEAM_EXPANSIONS)
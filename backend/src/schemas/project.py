@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from .task import TaskResponse
 from .user import UserResponse
 from .team import TeamResponse
@@ -20,12 +20,26 @@ class Project(ProjectBase):
     class Config:
         from_attributes = True
 
+class ProjectSummary(ProjectBase):
+    """Project list row: counts instead of embedded tasks"""
+    id: int
+    manager_id: int
+    manager_name: Optional[str] = None
+    team_id: Optional[int] = None
+    task_count: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    overdue: int
+    progress: float
+    last_activity: datetime
+
 class ProjectResponse(ProjectBase):
     id: int
     created_at: datetime
     manager_id: int
     team_id: Optional[int] = None
-    manager: UserResponse
+    # Optional only so ?include= can leave it out; every project has a manager
+    manager: Optional[UserResponse] = None
     team: Optional[TeamResponse] = None
     tasks: List[TaskResponse] = []
 
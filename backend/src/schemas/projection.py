@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Sequence, Type
+from pydantic import BaseModel
+from sqlalchemy import select, inspect
+from src.responses import FastJSONResponse
+from src.models.task import Task
+from src.models.project import Project
+from src.models.team import Team
+from src.models.user import User
+from src.models.notification import Notification
+from .task import TaskResponse
+from .project import ProjectResponse
+from .team import TeamListItem
+from .user import UserResponse
+from .notification import NotificationResponse
+
+def _utc_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive values are UTC, as TaskBase.ensure_timezone assumes"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+class Projection:
+    """
+    Read path for flat responses: selects only the response model's columns
+    as plain rows and writes them out with a serializer compiled once per
+    field set. No ORM instances are built and the output is not re-validated;
+    datetimes and enums are left for FastJSONResponse to encode natively.
+    Fields without a backing column are written with their model default;
+    converters stand in for validators that would have changed a value.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        entity,
+        exclude: Iterable[str] = (),
+        converters: Optional[Dict[str, Callable[[Any], Any]]] = None
+    ):
+        # Mapped columns, including SQL expressions such as Team.member_count
+        columns = {attribute.key: getattr(entity, attribute.key) for attribute in inspect(entity).mapper.column_attrs}
+        exclude = set(exclude)
+        self.model = model
+        self.fields = tuple(name for name in model.model_fields if name not in exclude)
+        self.columns = {name: columns[name] for name in self.fields if name in columns}
+        self.defaults = {
+            name: model.model_fields[name].get_default(call_default_factory=True)
+            for name in self.fields if name not in self.columns
+        }
+        self.converters = converters or {}
+        self._serializers: Dict[FrozenSet[str], Callable] = {}
+
+    def _names(self, fields: Optional[Iterable[str]]) -> Sequence[str]:
+        if fields is None:
+            return self.fields
+        fields = set(fields)
+        return [name for name in self.fields if name in fields]
+
+    def select(self, fields: Optional[Iterable[str]] = None, *extra):
+        """SELECT of the fields' columns in response order, then any extra columns"""
+        columns = [self.columns[name] for name in self._names(fields) if name in self.columns]
+        return select(*columns, *extra)
+
+    def serializer(self, fields: Optional[Iterable[str]] = None) -> Callable[[Sequence], dict]:
+        """Row -> dict function for rows from select() with the same fields"""
+        key = frozenset(self.fields if fields is None else fields)
+        serializer = self._serializers.get(key)
+        if serializer is None:
+            serializer = self._compile(self._names(fields))
+            self._serializers[key] = serializer
+        return serializer
+
+    def _compile(self, names: Sequence[str]) -> Callable[[Sequence], dict]:
+        """
+        Generate a function returning a dict literal, the way dataclasses
+        builds __init__, so each row costs one call and no per-field lookups.
+        """
+        namespace = {}
+        items = []
+        index = 0
+        for name in names:
+            if name in self.columns:
+                value = f"row[{index}]"
+                convert = self.converters.get(name)
+                if convert is not None:
+                    namespace[f"_{name}"] = convert
+                    value = f"_{name}({value})"
+                index += 1
+            else:
+                namespace[f"_{name}"] = self.defaults[name]
+                value = f"_{name}"
+            items.append(f"{name!r}: {value}")
+        exec(f"def serialize(row):\n    return {{{', '.join(items)}}}\n", namespace)
+        return namespace["serialize"]
+
+    def dump(self, rows: Iterable[Sequence], fields: Optional[Iterable[str]] = None) -> list:
+        serialize = self.serializer(fields)
+        return [serialize(row) for row in rows]
+
+    def render(self, rows: Iterable[Sequence], fields: Optional[Iterable[str]] = None) -> FastJSONResponse:
+        return FastJSONResponse(content=self.dump(rows, fields))
+
+# Flat shapes of the list endpoints; relationships are never part of them
+task_projection = Projection(
+    TaskResponse, Task, exclude=("assignee", "comments"), converters={"due_date": _utc_datetime}
+)
+# Exports leave out assignee_id, which no column backs (always null); the
+# assignee is in assigned_to
+task_export_projection = Projection(
+    TaskResponse, Task, exclude=("assignee", "comments", "assignee_id"), converters={"due_date": _utc_datetime}
+)
+project_projection = Projection(ProjectResponse, Project, exclude=("manager", "team", "tasks"))
+team_projection = Projection(TeamListItem, Team, exclude=("members",))
+user_projection = Projection(UserResponse, User)
+notification_projection = Projection(NotificationResponse, Notification)
@@ -0,0 +1,126 @@
+"""
+Response documents rendered by PostgreSQL as compact JSON text, byte for
+byte what pydantic's dump_json writes for the same model: fields in model
+order, no whitespace, datetimes as isoformat (UTC as Z, fraction only when
+non-zero) and enums by value. json_build_object and json_agg pad their
+output with spaces, so objects and arrays are concatenated instead.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import select, func, and_, case, cast, inspect, literal_column, Text, DateTime, Enum
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import aliased
+from src.models.comment import Comment
+from src.models.project import Project
+from src.models.task import Task
+from src.models.team import Team, team_members
+from src.models.user import User
+from .comment import CommentResponse
+from .project import ProjectResponse
+from .task import TaskResponse
+from .team import TeamResponse
+from .user import UserResponse
+
+def _datetime(column, aware: bool):
+    utc = func.timezone("UTC", column) if aware else column
+    parts = [
+        func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS'),
+        case((func.extract("microseconds", utc) % 1000000 != 0, func.concat(".", func.to_char(utc, "US")))),
+    ]
+    if aware:
+        parts.append("Z")
+    text = func.concat(*parts)
+    return case((column.is_(None), None), else_=func.concat('"', text, '"'))
+
+def _value(column):
+    """JSON text of a column value, NULL for SQL NULL"""
+    if isinstance(column.type, DateTime):
+        return _datetime(column, column.type.timezone)
+    if isinstance(column.type, Enum) and column.type.enum_class is not None:
+        # Stored by member name, written by value
+        return case(
+            *[
+                (cast(column, Text) == member.name, orjson.dumps(member.value).decode())
+                for member in column.type.enum_class
+            ],
+        )
+    return cast(func.to_json(column), Text)
+
+def json_object(model: Type[BaseModel], entity, nested: Optional[Dict[str, Any]] = None):
+    """
+    JSON text for one row of entity shaped as model. nested maps relationship
+    fields to JSON text expressions; other fields without a column get their
+    model default.
+    """
+    nested = nested or {}
+    columns = {attribute.key for attribute in inspect(entity).mapper.column_attrs}
+    parts = []
+    for index, name in enumerate(model.model_fields):
+        parts.append(("{" if index == 0 else ",") + orjson.dumps(name).decode() + ":")
+        if name in nested:
+            value = nested[name]
+        elif name in columns:
+            value = _value(getattr(entity, name))
+        else:
+            default = model.model_fields[name].get_default(call_default_factory=True)
+            parts.append(orjson.dumps(default).decode())
+            continue
+        parts.append(func.coalesce(value, "null"))
+    parts.append("}")
+
+    # concat() takes at most 100 arguments; chain it for wide models
+    chunks = [func.concat(*parts[i:i + 90]) for i in range(0, len(parts), 90)]
+    return chunks[0] if len(chunks) == 1 else func.concat(*chunks)
+
+def json_array(element, where, order_by):
+    """JSON array text of element over the rows matching where"""
+    return func.concat(
+        "[",
+        select(func.string_agg(element, aggregate_order_by(literal_column("','"), order_by)))
+        .where(where)
+        .scalar_subquery(),
+        "]",
+    )
+
+def user_json(user_id_column):
+    user = aliased(User)
+    return select(json_object(UserResponse, user)).where(user.id == user_id_column).scalar_subquery()
+
+def comment_json(comment):
+    return json_object(CommentResponse, comment, {"user": user_json(comment.user_id)})
+
+def task_json(task):
+    comment = aliased(Comment)
+    return json_object(TaskResponse, task, {
+        "assignee": user_json(task.assigned_to),
+        "comments": json_array(comment_json(comment), comment.task_id == task.id, comment.id),
+    })
+
+def team_json(team_id_column):
+    team = aliased(Team)
+    member = aliased(User)
+    members = json_array(
+        json_object(UserResponse, member),
+        and_(team_members.c.team_id == team.id, member.id == team_members.c.user_id),
+        member.id,
+    )
+    return (
+        select(json_object(TeamResponse, team, {"members": members}))
+        .where(team.id == team_id_column)
+        .scalar_subquery()
+    )
+
+@lru_cache(maxsize=None)
+def _project_document():
+    task = aliased(Task)
+    return select(json_object(ProjectResponse, Project, {
+        "manager": user_json(Project.manager_id),
+        "team": team_json(Project.team_id),
+        "tasks": json_array(task_json(task), task.project_id == Project.id, task.id),
+    }))
+
+def project_document(*where):
+    """SELECT of the full ProjectResponse JSON for the projects matching where"""
+    return _project_document().where(*where)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, model_validator, validator
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from .comment import CommentResponse
 from src.models.task import TaskPriority, TaskStatus
 from .user import UserResponse
@@ -40,12 +40,45 @@ class TaskBase(BaseModel):
 class TaskCreate(TaskBase):
     pass  # Inherits all fields from TaskBase
 
+class TaskBulkCreate(BaseModel):
+    """Items are validated one by one, so a bad item fails alone"""
+    tasks: List[Dict[str, Any]] = Field(..., min_length=1, max_length=5000)
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
     assigned_to: Optional[int] = None
 
+class TaskFilter(BaseModel):
+    """Server-side filters shared by the task listing endpoints"""
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    project_id: Optional[int] = None
+    assignee: Optional[int] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+
+class TaskBulkTarget(BaseModel):
+    """Tasks to change in bulk: explicit ids or a filter, not both"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filters: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def one_target(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Provide either ids or filters")
+        if self.filters is not None and not self.filters.model_dump(exclude_none=True):
+            # An empty filter would match every accessible task
+            raise ValueError("filters needs at least one criterion")
+        return self
+
+class TaskBulkStatus(TaskBulkTarget):
+    status: TaskStatus
+
+class TaskBulkAssign(TaskBulkTarget):
+    assigned_to: Optional[int] = None  # None unassigns
+
 class TaskResponse(TaskBase):
     id: int
     project_id: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List
 from .user import UserResponse
@@ -9,6 +9,10 @@ class TeamBase(BaseModel):
 class TeamCreate(TeamBase):
     pass
 
+class TeamMembersBulk(BaseModel):
+    """Users to add to or remove from a team in one statement"""
+    user_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
 class TeamResponse(TeamBase):
     id: int
     created_at: datetime
@@ -16,4 +20,8 @@ class TeamResponse(TeamBase):
     members: List[UserResponse] = []
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class TeamListItem(TeamResponse):
+    """Team list row: the member count always, the members when included"""
+    member_count: int 
\ No newline at end of file
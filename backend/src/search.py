@@ -0,0 +1,384 @@
+import math
+import re
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select, func, literal_column, union_all, tuple_, or_, case, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.auth.access import task_access_clause
+from src.database.settings import config
+from src.models.task import Task
+from src.models.comment import Comment
+from src.models.user import User
+from src.schemas.projection import task_projection, user_projection
+
+# Text search configuration of the search_vector columns (migration 6). 'simple'
+# does no stemming, which suits task text written in more than one language.
+SEARCH_CONFIG = "simple"
+
+# Trigger-maintained columns added by migration 6; not mapped, so the models stay
+# portable to databases without tsvector
+TASK_SEARCH_VECTOR = literal_column("tasks.search_vector", type_=TSVECTOR)
+COMMENT_SEARCH_VECTOR = literal_column("comments.search_vector", type_=TSVECTOR)
+
+# ts_rank's default weights for the labels the columns use
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2}
+
+# pg_trgm's default similarity threshold, which its % operator applies
+SIMILARITY_THRESHOLD = 0.3
+
+# Without pg_trgm, users are searched in a per-process directory rebuilt this often
+USER_DIRECTORY_TTL = config.getfloat('search', 'user_directory_ttl', fallback=60.0)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens, close to what the 'simple' configuration produces"""
+    return re.findall(r"\w+", text.lower()) if text else []
+
+@dataclass(frozen=True)
+class Term:
+    """A query word or quoted phrase, possibly excluded with a leading -"""
+    words: Tuple[str, ...]
+    negated: bool = False
+
+def parse_query(query: str) -> List[List[Term]]:
+    """
+    websearch_to_tsquery's syntax as AND-ed groups of OR-ed terms: words,
+    "quoted phrases", OR between two terms, and - in front of a term to
+    exclude it. A word that tokenizes to several (foo-bar) is a phrase.
+    """
+    groups: List[List[Term]] = []
+    pending_or = False
+    for match in re.finditer(r'(-?)"([^"]*)"?|(\S+)', query):
+        raw = match.group(3)
+        if raw is None:
+            negated, words = bool(match.group(1)), tokenize(match.group(2))
+        elif raw.lower() == "or":
+            pending_or = bool(groups)
+            continue
+        else:
+            negated = raw.startswith("-")
+            words = tokenize(raw[1:] if negated else raw)
+        if not words:
+            continue
+        term = Term(tuple(words), negated)
+        if pending_or:
+            groups[-1].append(term)
+        else:
+            groups.append([term])
+        pending_or = False
+    return groups
+
+class InvertedIndex:
+    """
+    In-process term -> document postings with weighted term frequencies and
+    positions. Matches the websearch syntax of the PostgreSQL search (see
+    parse_query) and ranks in the same spirit: title hits outweigh
+    description and comment hits.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.positions: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self.lengths: Dict[int, int] = defaultdict(int)
+        self.ends: Dict[int, int] = defaultdict(int)
+
+    def add(self, doc_id: int, text: Optional[str], weight: str = "A") -> None:
+        tokens = tokenize(text)
+        start = self.ends[doc_id]
+        self.lengths[doc_id] += len(tokens)
+        for offset, token in enumerate(tokens):
+            postings = self.postings[token]
+            postings[doc_id] = postings.get(doc_id, 0.0) + WEIGHTS[weight]
+            self.positions[token][doc_id].append(start + offset)
+        # A gap after each field, so phrases never span two
+        self.ends[doc_id] = start + len(tokens) + 1
+
+    def _matches(self, term: Term) -> Dict[int, float]:
+        """doc_id -> weight of the term's words, for the documents containing the term"""
+        first, *rest = term.words
+        docs = set(self.postings.get(first, {}))
+        for word in rest:
+            docs &= self.postings.get(word, {}).keys()
+        hits = {}
+        for doc_id in docs:
+            if rest:
+                # Phrase: the words at consecutive positions
+                starts = set(self.positions[first][doc_id])
+                for offset, word in enumerate(rest, 1):
+                    starts &= {position - offset for position in self.positions[word][doc_id]}
+                if not starts:
+                    continue
+            hits[doc_id] = sum(self.postings[word][doc_id] for word in term.words)
+        return hits
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """(doc_id, score) for documents matching the query, best first"""
+        groups = parse_query(query)
+        if not groups:
+            return []
+        matches: Optional[Set[int]] = None
+        weights: Dict[int, float] = defaultdict(float)
+        for group in groups:
+            matched = set()
+            for term in group:
+                hits = self._matches(term)
+                if term.negated:
+                    matched |= self.lengths.keys() - hits.keys()
+                else:
+                    matched |= hits.keys()
+                    for doc_id, weight in hits.items():
+                        weights[doc_id] += weight
+            matches = matched if matches is None else matches & matched
+        scores = [
+            (doc_id, weights[doc_id] / math.log2(2 + self.lengths[doc_id]))
+            for doc_id in matches
+        ]
+        scores.sort(key=lambda hit: (-hit[1], -hit[0]))
+        return scores
+
+async def search_tasks_postgres(
+    db: AsyncSession,
+    user_id: int,
+    q: str,
+    limit: int,
+    after: Optional[Sequence] = None
+) -> list:
+    """
+    (task row..., rank) for accessible tasks whose text or comments match,
+    best first, using the GIN indexes on the generated tsvector columns.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # Both branches are limited to the caller's tasks, so the ranking work
+    # follows what the user can see rather than the whole database
+    hits = union_all(
+        select(Task.id.label("task_id"), func.ts_rank(TASK_SEARCH_VECTOR, query).label("rank"))
+        .where(TASK_SEARCH_VECTOR.op("@@")(query), task_access_clause(user_id)),
+        select(Comment.task_id, func.ts_rank(COMMENT_SEARCH_VECTOR, query))
+        .where(
+            COMMENT_SEARCH_VECTOR.op("@@")(query),
+            Comment.task_id.in_(select(Task.id).where(task_access_clause(user_id))),
+        ),
+    ).subquery()
+    ranked = (
+        select(hits.c.task_id, func.sum(hits.c.rank).label("rank"))
+        .group_by(hits.c.task_id)
+        .subquery()
+    )
+    statement = (
+        task_projection.select(None, ranked.c.rank)
+        .join_from(Task, ranked, ranked.c.task_id == Task.id)
+        .order_by(ranked.c.rank.desc(), Task.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        statement = statement.where(tuple_(ranked.c.rank, Task.id) < tuple_(*after))
+    result = await db.execute(statement)
+    return result.all()
+
+async def search_tasks_in_memory(
+    db: AsyncSession,
+    user_id: int,
+    q: str,
+    limit: int,
+    after: Optional[Sequence] = None
+) -> list:
+    """
+    Same contract as search_tasks_postgres, for databases without full-text
+    search: indexes the accessible tasks and their comments per request.
+    """
+    result = await db.execute(
+        select(Task.id, Task.title, Task.description).where(task_access_clause(user_id))
+    )
+    index = InvertedIndex()
+    for task_id, title, description in result:
+        index.add(task_id, title, "A")
+        index.add(task_id, description, "B")
+    comments = await db.execute(
+        select(Comment.task_id, Comment.text)
+        .where(Comment.task_id.in_(select(Task.id).where(task_access_clause(user_id))))
+    )
+    for task_id, body in comments:
+        index.add(task_id, body, "C")
+
+    hits = index.search(q)
+    if after is not None:
+        hits = [(task_id, score) for task_id, score in hits if (score, task_id) < tuple(after)]
+    hits = hits[:limit]
+    if not hits:
+        return []
+
+    scores = dict(hits)
+    rows = await db.execute(task_projection.select().where(Task.id.in_(scores)))
+    by_id = {row.id: row for row in rows}
+    return [(*by_id[task_id], score) for task_id, score in hits]
+
+async def search_tasks(db: AsyncSession, user_id: int, q: str, limit: int, after: Optional[Sequence] = None) -> list:
+    """Full-text search on PostgreSQL, the inverted index elsewhere"""
+    if db.bind.dialect.name == "postgresql":
+        return await search_tasks_postgres(db, user_id, q, limit, after)
+    return await search_tasks_in_memory(db, user_id, q, limit, after)
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """pg_trgm's trigram set: each lowercased word padded with two spaces before and one after"""
+    grams = set()
+    for word in re.findall(r"[^\W_]+", text.lower()) if text else []:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def _like_escape(value: str) -> str:
+    return re.sub(r"([\\%_])", r"\\\1", value)
+
+class UserIndex:
+    """
+    Sorted prefix keys and trigram postings over users' names and emails.
+    Matches and ranks as the pg_trgm query does: a name word or email prefix
+    scores 1, plus the best trigram similarity of name or email.
+    """
+
+    def __init__(self, users: Iterable[Tuple[int, Optional[str], Optional[str]]]):
+        keys = []
+        self.sizes: Dict[int, Tuple[int, int]] = {}
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for user_id, full_name, email in users:
+            name = (full_name or "").lower()
+            email = (email or "").lower()
+            # The whole name, each remainder after a space, and the email
+            keys.append((name, user_id))
+            keys.extend((name[i + 1:], user_id) for i, char in enumerate(name) if char == " ")
+            keys.append((email, user_id))
+            name_grams, email_grams = trigrams(name), trigrams(email)
+            self.sizes[user_id] = (len(name_grams), len(email_grams))
+            for gram in name_grams:
+                self.postings[gram].append((user_id, 0))
+            for gram in email_grams:
+                self.postings[gram].append((user_id, 1))
+        keys.sort()
+        self.keys = keys
+
+    def prefixed(self, prefix: str) -> Set[int]:
+        """Users with a key starting with prefix, by binary search over the sorted keys"""
+        matches = set()
+        index = bisect_left(self.keys, (prefix,))
+        while index < len(self.keys) and self.keys[index][0].startswith(prefix):
+            matches.add(self.keys[index][1])
+            index += 1
+        return matches
+
+    def search(self, q: str, allowed: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """(user_id, rank) of matching users, best first"""
+        query_grams = trigrams(q)
+        shared: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        for gram in query_grams:
+            for user_id, field in self.postings.get(gram, ()):
+                shared[user_id][field] += 1
+
+        def similarity(user_id: int) -> float:
+            counts = shared.get(user_id)
+            if counts is None:
+                return 0.0
+            return max(
+                count / (len(query_grams) + size - count)
+                for count, size in zip(counts, self.sizes[user_id])
+            )
+
+        ranks = {}
+        for user_id in shared:
+            score = similarity(user_id)
+            if score >= SIMILARITY_THRESHOLD:
+                ranks[user_id] = score
+        for user_id in self.prefixed(q.lower()):
+            ranks[user_id] = 1.0 + similarity(user_id)
+        hits = [(user_id, rank) for user_id, rank in ranks.items() if allowed is None or user_id in allowed]
+        hits.sort(key=lambda hit: (-hit[1], hit[0]))
+        return hits
+
+class UserDirectory:
+    """
+    Per-process UserIndex of active users, rebuilt after max_age seconds or
+    once invalidated by a user change on this worker.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._index: Optional[UserIndex] = None
+        self._expires = 0.0
+
+    def invalidate(self) -> None:
+        self._expires = 0.0
+
+    async def index(self, db: AsyncSession) -> UserIndex:
+        if self._index is None or self._expires < time.monotonic():
+            result = await db.execute(
+                select(User.id, User.full_name, User.email).where(User.is_active.is_(True))
+            )
+            self._index = UserIndex(result)
+            self._expires = time.monotonic() + self.max_age
+        return self._index
+
+user_directory = UserDirectory(USER_DIRECTORY_TTL)
+
+_trigram_available: Dict[str, bool] = {}
+
+async def trigram_available(db: AsyncSession) -> bool:
+    """Whether pg_trgm is installed (migration 9), checked once per database"""
+    url = str(db.bind.url)
+    if url not in _trigram_available:
+        if db.bind.dialect.name == "postgresql":
+            _trigram_available[url] = bool(await db.scalar(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            ))
+        else:
+            _trigram_available[url] = False
+    return _trigram_available[url]
+
+async def search_users_trigram(db: AsyncSession, q: str, limit: int, scope=None) -> list:
+    """
+    (user row..., rank) for active users whose name or email starts with q,
+    has a word starting with q, or is trigram-similar to it, best first.
+    Served by the pg_trgm GIN indexes; scope is a subquery of user ids.
+    """
+    pattern = _like_escape(q)
+    prefix = or_(
+        User.full_name.ilike(f"{pattern}%", escape="\\"),
+        User.full_name.ilike(f"% {pattern}%", escape="\\"),
+        User.email.ilike(f"{pattern}%", escape="\\"),
+    )
+    rank = (
+        case((prefix, 1.0), else_=0.0)
+        + func.greatest(func.similarity(User.full_name, q), func.similarity(User.email, q))
+    ).label("rank")
+    statement = (
+        user_projection.select(None, rank)
+        .where(User.is_active.is_(True), or_(prefix, User.full_name.op("%")(q), User.email.op("%")(q)))
+        .order_by(rank.desc(), User.id)
+        .limit(limit)
+    )
+    if scope is not None:
+        statement = statement.where(User.id.in_(scope))
+    result = await db.execute(statement)
+    return result.all()
+
+async def search_users_in_memory(db: AsyncSession, q: str, limit: int, scope=None) -> list:
+    """Same contract as search_users_trigram, from the per-process user directory"""
+    index = await user_directory.index(db)
+    allowed = None
+    if scope is not None:
+        allowed = set((await db.execute(scope)).scalars())
+    hits = index.search(q, allowed)[:limit]
+    if not hits:
+        return []
+
+    rows = await db.execute(user_projection.select().where(User.id.in_([user_id for user_id, _ in hits])))
+    by_id = {row.id: row for row in rows}
+    # A user removed since the directory was built is skipped
+    return [(*by_id[user_id], rank) for user_id, rank in hits if user_id in by_id]
+
+async def search_users(db: AsyncSession, q: str, limit: int, scope=None) -> list:
+    """Trigram search where pg_trgm is installed, the user directory elsewhere"""
+    if await trigram_available(db):
+        return await search_users_trigram(db, q, limit, scope)
+    return await search_users_in_memory(db, q, limit, scope)
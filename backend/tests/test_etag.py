@@ -0,0 +1,79 @@
+"""Conditional GETs on the list endpoints (needs TEST_DATABASE_URL)"""
+import pytest
+
+LISTS = ("/projects/tasks/", "/projects/projects/", "/teams/")
+
+@pytest.fixture
+def owner(client, register):
+    """A user with a team, a project of that team and a task"""
+    user, headers, _ = register("owner")
+    team = client.post("/teams/", json={"name": "Team"}, headers=headers).json()
+    project = client.post("/projects/projects/", json={"name": "Project"}, headers=headers).json()
+    task = client.post("/projects/tasks/", json={"title": "Task", "project_id": project["id"]}, headers=headers).json()
+    return user, headers, project, {**task, "team_id": team["id"]}
+
+def etags(client, headers, urls=LISTS):
+    return {url: client.get(url, headers=headers).headers["etag"] for url in urls}
+
+def statuses(client, headers, tags):
+    return [client.get(url, headers={**headers, "If-None-Match": tag}).status_code for url, tag in tags.items()]
+
+def test_unchanged_lists_answer_304(client, owner):
+    _, headers, _, _ = owner
+    tags = etags(client, headers)
+    assert all(tag.startswith('W/"') for tag in tags.values())
+    assert statuses(client, headers, tags) == [304, 304, 304]
+
+def test_each_page_and_selection_has_its_own_etag(client, owner):
+    _, headers, _, _ = owner
+    a, b = etags(client, headers, ["/projects/tasks/?limit=1"]), etags(client, headers, ["/projects/tasks/?fields=id"])
+    assert a["/projects/tasks/?limit=1"] != b["/projects/tasks/?fields=id"]
+
+def test_task_writes_move_the_etags(client, owner):
+    _, headers, project, task = owner
+    urls = ("/projects/tasks/", "/projects/projects/")
+
+    tags = etags(client, headers, urls)
+    client.put(f"/projects/tasks/{task['id']}", json={"title": "Renamed"}, headers=headers)
+    assert statuses(client, headers, tags) == [200, 200]
+
+    tags = etags(client, headers, urls)
+    client.patch("/projects/tasks/status", json={"ids": [task["id"]], "status": "DONE"}, headers=headers)
+    assert statuses(client, headers, tags) == [200, 200]
+
+    tags = etags(client, headers, urls)
+    client.post(f"/projects/tasks/{task['id']}/comments", json={"text": "hi"}, headers=headers)
+    assert statuses(client, headers, tags) == [200, 200]
+
+    tags = etags(client, headers, urls)
+    client.post("/projects/tasks/", json={"title": "Another", "project_id": project["id"]}, headers=headers)
+    assert statuses(client, headers, tags) == [200, 200]
+
+def test_other_users_writes_leave_the_etags_alone(client, owner, register):
+    _, headers, _, _ = owner
+    tags = etags(client, headers)
+    _, other_headers, _ = register("stranger")
+    project = client.post("/projects/projects/", json={"name": "Elsewhere"}, headers=other_headers).json()
+    client.post("/projects/tasks/", json={"title": "Elsewhere", "project_id": project["id"]}, headers=other_headers)
+    assert statuses(client, headers, tags) == [304, 304, 304]
+
+def test_embedded_user_changes_move_the_etags(client, owner, register):
+    """
+    Lists embed users (assignees, commenters, managers, members) but the
+    task-list validator only covers project versions. user_references_changed
+    has to bump them; any new write path changing embedded data must too.
+    """
+    owner_user, headers, _, task = owner
+    assignee, assignee_headers, _ = register("assignee")
+    commenter, commenter_headers, _ = register("commenter")
+    assert client.post(f"/teams/{task['team_id']}/members/{commenter['id']}", headers=headers).status_code == 200
+    assert client.post(f"/projects/tasks/{task['id']}/assign/{assignee['id']}", headers=headers).status_code == 200
+    comment = client.post(f"/projects/tasks/{task['id']}/comments", json={"text": "hi"}, headers=commenter_headers)
+    assert comment.status_code == 200
+
+    for user, user_headers in ((assignee, assignee_headers), (commenter, commenter_headers), (owner_user, headers)):
+        tags = etags(client, headers)
+        renamed = {**user, "full_name": user["full_name"] + " Renamed"}
+        assert client.put(f"/users/{user['id']}", json=renamed, headers=user_headers).status_code == 200
+        urls = ["/projects/tasks/", "/projects/projects/"] + (["/teams/"] if user is not assignee else [])
+        assert statuses(client, headers, {url: tags[url] for url in urls}) == [200] * len(urls)
@@ -0,0 +1,71 @@
+"""?fields= and ?include= parsing (Selection)"""
+import json
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from src.models.comment import Comment
+from src.models.project import Project
+from src.models.task import Task, TaskPriority, TaskStatus
+from src.models.user import User, UserRole
+from src.schemas.expand import project_selection, task_selection
+
+def select_project(fields=None, include=None):
+    return project_selection(fields=fields, include=include)
+
+def test_default_includes_everything():
+    selection = select_project()
+    assert selection.is_default
+    assert selection.fields is None
+    assert selection.include == {
+        "manager", "team", "team.members", "tasks",
+        "tasks.assignee", "tasks.comments", "tasks.comments.user",
+    }
+
+def test_fields_bring_default_nested_relationships():
+    selection = select_project(fields="id,tasks")
+    assert selection.fields == {"id", "tasks"}
+    assert selection.include == {"tasks", "tasks.assignee", "tasks.comments", "tasks.comments.user"}
+    assert not selection.flat
+
+def test_fields_without_relationships_are_flat():
+    selection = select_project(fields="id, name")
+    assert selection.include == set()
+    assert selection.flat
+
+def test_explicit_include_wins():
+    selection = select_project(fields="id,tasks", include="tasks")
+    assert selection.include == {"tasks"}
+    assert select_project(include="").flat
+
+def test_nested_include_implies_parents():
+    assert task_selection(fields=None, include="comments.user").include == {"comments", "comments.user"}
+
+def test_include_outside_fields_is_dropped():
+    assert select_project(fields="id", include="tasks,manager").include == set()
+
+@pytest.mark.parametrize("fields, include", [("id,nope", None), (None, "tasks.nope"), (None, "owner")])
+def test_unknown_names_are_rejected(fields, include):
+    with pytest.raises(HTTPException) as error:
+        select_project(fields=fields, include=include)
+    assert error.value.status_code == 400
+
+def project():
+    created = datetime(2024, 5, 1, 12, 0)
+    user = User(id=1, email="a@example.com", full_name="A", role=UserRole.USER, is_active=True, created_at=created)
+    task = Task(
+        id=10, title="t", description=None, due_date=None, priority=TaskPriority.MEDIUM,
+        status=TaskStatus.TODO, project_id=5, assigned_to=1, created_at=created, assignee=user,
+        comments=[Comment(id=100, text="c", task_id=10, user_id=1, created_at=created, user=user)],
+    )
+    return Project(id=5, name="P", manager_id=1, team_id=None, created_at=created, manager=user, team=None, tasks=[task])
+
+def test_render_trims_to_the_selection():
+    body = json.loads(select_project(fields="id,tasks").render(project()).body)
+    assert set(body) == {"id", "tasks"}
+    assert body["tasks"][0]["assignee"]["id"] == 1
+    assert body["tasks"][0]["comments"][0]["user"]["id"] == 1
+
+    body = json.loads(select_project(fields="id,tasks", include="tasks").render([project()]).body)
+    assert set(body[0]["tasks"][0]) >= {"id", "title"}
+    assert "assignee" not in body[0]["tasks"][0]
+    assert "comments" not in body[0]["tasks"][0]
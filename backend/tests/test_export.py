@@ -0,0 +1,21 @@
+"""Task export (needs TEST_DATABASE_URL)"""
+import csv
+import io
+import json
+
+def test_export_carries_the_assignee(client, register):
+    me, headers, _ = register("export")
+    project = client.post("/projects/projects/", json={"name": "Export"}, headers=headers).json()
+    client.post("/projects/tasks/", json={"title": "Mine", "project_id": project["id"], "assigned_to": me["id"]}, headers=headers)
+    client.post("/projects/tasks/", json={"title": "Nobody's", "project_id": project["id"]}, headers=headers)
+
+    response = client.get("/projects/tasks/export", params={"format": "csv", "project_id": project["id"]}, headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert "assignee_id" not in rows[0]
+    assert [(row["title"], row["assigned_to"]) for row in rows] == [("Mine", str(me["id"])), ("Nobody's", "")]
+
+    response = client.get("/projects/tasks/export", params={"project_id": project["id"]}, headers=headers)
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(record["title"], record["assigned_to"]) for record in records] == [("Mine", me["id"]), ("Nobody's", None)]
+    assert all("assignee_id" not in record for record in records)
@@ -0,0 +1,25 @@
+"""Operational metrics are admin-only (needs TEST_DATABASE_URL)"""
+from sqlalchemy import update
+from src.auth.cache import principal_cache
+from src.database.config import AsyncSessionLocal
+from src.models.user import User, UserRole
+
+URLS = ("/metrics/db", "/metrics/auth")
+
+def test_metrics_require_an_admin(client, register, run_async):
+    assert [client.get(url).status_code for url in URLS] == [401, 401]
+
+    me, headers, _ = register("metrics")
+    assert [client.get(url, headers=headers).status_code for url in URLS] == [403, 403]
+
+    async def promote():
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(User).where(User.id == me["id"]).values(role=UserRole.ADMIN))
+            await db.commit()
+    run_async(promote)
+    principal_cache.invalidate_user(me["id"])
+
+    responses = [client.get(url, headers=headers) for url in URLS]
+    assert [response.status_code for response in responses] == [200, 200]
+    assert "primary" in responses[0].json()
+    assert "principal_cache" in responses[1].json()
@@ -0,0 +1,67 @@
+"""Keyset cursors (src.database.pagination)"""
+import base64
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_engine, insert, select
+from src.database.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_after
+
+def tampered(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def test_cursor_round_trip():
+    values = [datetime(2024, 5, 1, 12, 30, 15, 123456), 42]
+    assert decode_cursor(encode_cursor(values), (datetime, int)) == values
+    assert decode_cursor(encode_cursor([0.25, 7]), (float, int)) == [0.25, 7]
+
+@pytest.mark.parametrize("cursor", [
+    "WzEsMl0",                      # [1,2]: an int where a datetime belongs
+    tampered([{"dt": "2024-05-01T00:00:00"}, "7"]),
+    tampered([{"dt": "2024-05-01T00:00:00"}, True]),
+    tampered([{"dt": "not a date"}, 7]),
+    tampered([{"dt": "2024-05-01T00:00:00"}]),
+    tampered({"dt": "2024-05-01T00:00:00"}),
+    "%%%",
+    "",
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, (datetime, int))
+
+def test_rank_cursor_types():
+    assert decode_cursor(tampered([1, 7]), (float, int)) == [1, 7]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(tampered([0.5, 7.5]), (float, int))
+
+def test_pages_have_no_duplicates_or_gaps():
+    metadata = MetaData()
+    rows = Table(
+        "rows", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("created_at", DateTime, nullable=False),
+    )
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        # Many rows share a created_at, so pages break inside runs of ties
+        conn.execute(insert(rows), [
+            {"id": i, "created_at": start + timedelta(minutes=i // 4)} for i in range(1, 51)
+        ])
+
+        seen, cursor = [], None
+        while True:
+            query = select(rows.c.id, rows.c.created_at).order_by(
+                rows.c.created_at.desc(), rows.c.id.desc()
+            ).limit(7)
+            after = keyset_after([rows.c.created_at, rows.c.id], cursor, (datetime, int))
+            if after is not None:
+                query = query.where(after)
+            page = conn.execute(query).all()
+            if not page:
+                break
+            seen.extend(row.id for row in page)
+            cursor = encode_cursor([page[-1].created_at, page[-1].id])
+
+    expected = sorted(range(1, 51), key=lambda i: (i // 4, i), reverse=True)
+    assert seen == expected
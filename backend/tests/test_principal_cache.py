@@ -0,0 +1,83 @@
+"""Principal cache behind get_current_user"""
+from datetime import datetime
+import pytest
+from sqlalchemy.orm.exc import DetachedInstanceError
+from src.auth import cache as cache_module
+from src.auth.cache import PrincipalCache, principal_cache
+from src.models.user import User, UserRole
+
+def user(id: int, email: str) -> User:
+    return User(
+        id=id, email=email, full_name="Name", hashed_password="x",
+        role=UserRole.USER, is_active=True, created_at=datetime(2024, 1, 1),
+    )
+
+def test_hit_returns_a_fresh_detached_copy():
+    cache = PrincipalCache(60, 10)
+    cache.put("a@example.com", user(1, "a@example.com"))
+    first, second = cache.get("a@example.com"), cache.get("a@example.com")
+    assert first is not second
+    assert (first.id, first.email, first.role) == (1, "a@example.com", UserRole.USER)
+    # Columns only: relationships cannot be loaded from a cached principal
+    with pytest.raises(DetachedInstanceError):
+        first.teams
+    assert cache.snapshot()["hits"] == 2
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PrincipalCache(60, 10)
+    cache.put("a@example.com", user(1, "a@example.com"))
+    now[0] += 59
+    assert cache.get("a@example.com") is not None
+    now[0] += 2
+    assert cache.get("a@example.com") is None
+
+def test_least_recently_used_is_evicted():
+    cache = PrincipalCache(60, 2)
+    cache.put("a", user(1, "a"))
+    cache.put("b", user(2, "b"))
+    cache.get("a")
+    cache.put("c", user(3, "c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+def test_invalidate_user_drops_every_subject_of_the_user():
+    cache = PrincipalCache(60, 10)
+    cache.put("old@example.com", user(1, "old@example.com"))
+    cache.put("new@example.com", user(1, "new@example.com"))
+    cache.put("other@example.com", user(2, "other@example.com"))
+    cache.invalidate_user(1)
+    assert cache.get("old@example.com") is None and cache.get("new@example.com") is None
+    assert cache.get("other@example.com") is not None
+
+def test_disabled_cache_stores_nothing():
+    cache = PrincipalCache(0, 10)
+    cache.put("a", user(1, "a"))
+    assert cache.get("a") is None
+
+# API tests (need TEST_DATABASE_URL)
+
+def test_cache_hit_requests_work(client, register):
+    me, headers, _ = register("cached")
+    client.get("/auth/me", headers=headers)
+    hits = principal_cache.hits
+    assert client.get("/auth/me", headers=headers).json()["id"] == me["id"]
+    # Attaches the cached principal to the new team's members
+    team = client.post("/teams/", json={"name": "Cached"}, headers=headers)
+    assert team.status_code == 200
+    assert [member["id"] for member in team.json()["members"]] == [me["id"]]
+    assert principal_cache.hits > hits
+
+def test_update_user_is_seen_by_the_next_request(client, register):
+    me, headers, _ = register("rename")
+    client.get("/auth/me", headers=headers)
+    updated = client.put(f"/users/{me['id']}", json={**me, "full_name": "Renamed"}, headers=headers)
+    assert updated.status_code == 200
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Renamed"
+
+def test_deleted_user_is_rejected_at_once(client, register):
+    me, headers, _ = register("delete")
+    client.get("/auth/me", headers=headers)
+    assert client.delete(f"/users/{me['id']}", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
@@ -0,0 +1,88 @@
+"""Compiled projection serializers must write the same bytes as the pydantic path"""
+from datetime import datetime, timezone
+from typing import List
+import pytest
+from src.models.notification import Notification
+from src.models.project import Project
+from src.models.task import Task, TaskPriority, TaskStatus
+from src.models.team import Team
+from src.models.user import User, UserRole
+from src.responses import FastJSONResponse, model_response
+from src.schemas.projection import (
+    notification_projection, project_projection, task_projection, team_projection, user_projection,
+)
+
+CREATED = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+def users():
+    return [
+        User(id=1, email="a@example.com", full_name="Ádám \"A\" ✓", role=UserRole.ADMIN, is_active=True, created_at=CREATED),
+        User(id=2, email="b@example.com", full_name="B", role=UserRole.USER, is_active=False, created_at=CREATED),
+    ]
+
+def tasks():
+    return [
+        Task(
+            id=1, title="Naive due date", description="line\nbreak", due_date=datetime(2024, 6, 1, 9, 0),
+            priority=TaskPriority.HIGH, status=TaskStatus.IN_PROGRESS, project_id=3, assigned_to=2, created_at=CREATED,
+        ),
+        Task(
+            id=2, title="No due date", description=None, due_date=None, priority=TaskPriority.LOW,
+            status=TaskStatus.TODO, project_id=3, assigned_to=None, created_at=CREATED,
+        ),
+        Task(
+            id=3, title="Aware due date", description="", due_date=datetime(2024, 6, 1, 9, 0, tzinfo=timezone.utc),
+            priority=TaskPriority.MEDIUM, status=TaskStatus.DONE, project_id=4, assigned_to=1, created_at=CREATED,
+        ),
+    ]
+
+def projects():
+    return [
+        Project(id=3, name="P", manager_id=1, team_id=None, created_at=CREATED),
+        Project(id=4, name="Q", manager_id=2, team_id=7, created_at=CREATED),
+    ]
+
+def teams():
+    team = Team(id=7, name="T", manager_id=1, created_at=CREATED)
+    team.member_count = 3
+    return [team]
+
+def notifications():
+    return [Notification(id=1, user_id=1, message="hi", is_read=False, created_at=CREATED)]
+
+def rows(projection, objs, fields=None):
+    """The rows projection.select(fields) would return for these objects"""
+    columns = projection.select(fields).selected_columns
+    return [tuple(getattr(obj, column.key) for column in columns) for obj in objs]
+
+def excluded(projection):
+    return {name for name in projection.model.model_fields if name not in projection.fields}
+
+CASES = [
+    (task_projection, tasks),
+    (project_projection, projects),
+    (team_projection, teams),
+    (user_projection, users),
+    (notification_projection, notifications),
+]
+
+@pytest.mark.parametrize("projection, make", CASES)
+def test_serializer_matches_pydantic_bytes(projection, make):
+    objs = make()
+    expected = model_response(
+        List[projection.model], objs, exclude={"__all__": excluded(projection)} if excluded(projection) else None
+    ).body
+    assert projection.render(rows(projection, objs)).body == expected
+
+@pytest.mark.parametrize("fields", [{"id", "title"}, {"due_date", "status", "assignee_id"}, {"id"}])
+def test_field_subsets_match_pydantic_bytes(fields):
+    objs = tasks()
+    expected = model_response(List[task_projection.model], objs, include={"__all__": fields}).body
+    assert task_projection.render(rows(task_projection, objs, fields), fields).body == expected
+
+def test_serializer_is_compiled_once_per_field_set():
+    assert task_projection.serializer({"id", "title"}) is task_projection.serializer({"title", "id"})
+    assert task_projection.serializer() is not task_projection.serializer({"id"})
+
+def test_empty_list():
+    assert task_projection.render([]).body == FastJSONResponse(content=[]).body == b"[]"
@@ -0,0 +1,82 @@
+"""Refresh-token rotation and reuse detection (needs TEST_DATABASE_URL)"""
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from src.auth.refresh import purge_refresh_tokens
+from src.database.config import AsyncSessionLocal
+from src.models.refresh_token import RefreshToken
+
+def refresh(client, token):
+    return client.post("/auth/refresh-token", json={"refresh_token": token})
+
+def test_rotation_returns_working_tokens(client, register):
+    _, _, tokens = register("rotate")
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    me = client.get("/auth/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.status_code == 200
+
+    # The replacement can be spent in turn
+    assert refresh(client, rotated["refresh_token"]).status_code == 200
+
+def test_reuse_revokes_the_whole_family(client, register):
+    _, _, tokens = register("reuse")
+    first = tokens["refresh_token"]
+    second = refresh(client, first).json()["refresh_token"]
+
+    reused = refresh(client, first)
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Refresh token reuse detected"
+
+    # The legitimate holder's newer token died with the family
+    assert refresh(client, second).status_code == 401
+
+def test_other_logins_are_separate_families(client, register):
+    user, _, tokens = register("family")
+    other = client.post("/auth/login", data={"username": user["email"], "password": "pw"}).json()
+    second = refresh(client, tokens["refresh_token"]).json()["refresh_token"]
+    refresh(client, tokens["refresh_token"])  # reuse kills the first family only
+    assert refresh(client, second).status_code == 401
+    assert refresh(client, other["refresh_token"]).status_code == 200
+
+def test_tampered_and_malformed_tokens(client, register):
+    _, _, tokens = register("tamper")
+    token_id, _, secret = tokens["refresh_token"].partition(".")
+    assert refresh(client, f"{token_id}.{secret[::-1]}").status_code == 401
+    assert refresh(client, "no-dot").status_code == 401
+    # A forged secret is not reuse: the real token still works
+    assert refresh(client, tokens["refresh_token"]).status_code == 200
+
+def test_logout_revokes_the_family(client, register):
+    _, headers, tokens = register("logout")
+    assert client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers).status_code == 200
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+def test_purge_keeps_spent_tokens_until_they_expire(client, register, run_async):
+    _, _, tokens = register("purge")
+    spent = tokens["refresh_token"]
+    live = refresh(client, spent).json()["refresh_token"]
+    _, _, expired = register("purge")
+    _, revoked_headers, revoked = register("purge")
+    client.post("/auth/logout", json={"refresh_token": revoked["refresh_token"]}, headers=revoked_headers)
+
+    async def purge():
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.id == expired["refresh_token"].partition(".")[0])
+                .values(expires_at=datetime.utcnow() - timedelta(days=1))
+            )
+            await db.commit()
+            await purge_refresh_tokens(db)
+            result = await db.execute(select(RefreshToken.id))
+            return set(result.scalars())
+
+    remaining = run_async(purge)
+    ids = lambda *tokens: {token.partition(".")[0] for token in tokens}
+    assert ids(spent, live) <= remaining
+    assert not ids(expired["refresh_token"], revoked["refresh_token"]) & remaining
+    # The spent token is still recognised as reuse
+    assert refresh(client, spent).json()["detail"] == "Refresh token reuse detected"
@@ -0,0 +1,54 @@
+"""FastJSONResponse (orjson) against Starlette's JSONResponse (json.dumps)"""
+import json
+from datetime import datetime, timezone
+from enum import Enum
+import pytest
+from fastapi.responses import JSONResponse
+from src.responses import FastJSONResponse
+
+PAYLOADS = [
+    [],
+    {},
+    {"id": 1, "title": "Plain", "done": False, "description": None},
+    {"text": "ünïcödé ✓ 漢字 \U0001F600", "quotes": "\"q\" \\ /", "control": "\x00\x1f\n\t "},
+    {"rank": 0.6079270839691162, "progress": 0.1, "whole": 1.0, "negative": -0.0, "big": 1e300},
+    {"ints": [0, -1, 2**31, 2**53 + 1, 2**63 - 1, -(2**63)]},
+    [{"nested": [{"deep": [1, [2, [3]]]}]}],
+    {1: "int keys", 2: "are strings in both"},
+]
+
+def encode_both(content):
+    return FastJSONResponse(content=content).body, JSONResponse(content=content).body
+
+@pytest.mark.parametrize("content", PAYLOADS)
+def test_same_bytes_for_json_safe_content(content):
+    fast, standard = encode_both(content)
+    assert fast == standard
+
+@pytest.mark.parametrize("value", [1e16, 1e-7, 5e-324, 1.2345678901234568e16, 3.4e-10])
+def test_exponent_spelling_may_differ_but_values_agree(value):
+    fast, standard = encode_both({"value": value})
+    assert json.loads(fast) == json.loads(standard) == {"value": value}
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_floats_become_null_where_starlette_raises(value):
+    assert FastJSONResponse(content={"value": value}).body == b'{"value":null}'
+    with pytest.raises(ValueError):
+        JSONResponse(content={"value": value})
+
+def test_integers_beyond_64_bits_raise():
+    with pytest.raises(TypeError):
+        FastJSONResponse(content={"value": 2**64})
+    assert JSONResponse(content={"value": 2**64}).body == b'{"value":18446744073709551616}'
+
+def test_datetimes_and_enums_are_encoded_natively():
+    class Status(str, Enum):
+        DONE = "DONE"
+    content = {
+        "aware": datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+        "naive": datetime(2024, 5, 1, 12, 0),
+        "status": Status.DONE,
+    }
+    assert FastJSONResponse(content=content).body == (
+        b'{"aware":"2024-05-01T12:00:00.123456Z","naive":"2024-05-01T12:00:00","status":"DONE"}'
+    )
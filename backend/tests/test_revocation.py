@@ -0,0 +1,88 @@
+"""Access-token revocation: the Bloom filter and RevocationList syncing"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from src.auth import revocation
+from src.auth.revocation import BloomFilter, RevocationList
+from src.database.config import AsyncSessionLocal
+from src.models.revoked_token import RevokedToken
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    # Sized for 1%; allow slack for the hash spread
+    assert false_positives < 300
+
+def new_jti() -> str:
+    return uuid.uuid4().hex
+
+async def revoke(jti: str, expires_in: timedelta = timedelta(hours=1)) -> None:
+    """Record a revocation the way another worker would"""
+    async with AsyncSessionLocal() as db:
+        await RevocationList(16, 0.01, 0).revoke(db, jti, datetime.utcnow() + expires_in)
+        await db.commit()
+
+async def is_revoked(revocations: RevocationList, jti: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        return await revocations.is_revoked(db, jti)
+
+def test_sync_picks_up_other_workers_revocations(client, run_async):
+    revocations = RevocationList(16, 0.01, sync_seconds=0)
+    jti = new_jti()
+    assert run_async(is_revoked, revocations, jti) is False
+    run_async(revoke, jti)
+    assert run_async(is_revoked, revocations, jti) is True
+
+def test_stale_filter_waits_for_the_sync_interval(client, run_async):
+    revocations = RevocationList(16, 0.01, sync_seconds=3600)
+    run_async(revocations.load)
+    jti = new_jti()
+    run_async(revoke, jti)
+    assert run_async(is_revoked, revocations, jti) is False
+    run_async(revocations.load, revocations.bloom)
+    assert run_async(is_revoked, revocations, jti) is True
+
+def test_full_filter_is_rebuilt_once_and_grows(client, run_async, monkeypatch):
+    revocations = RevocationList(4, 0.01, sync_seconds=0)
+    run_async(revocations.load)
+    jtis = [new_jti() for _ in range(8)]
+    for jti in jtis:
+        run_async(revoke, jti)
+    assert all(run_async(is_revoked, revocations, jti) for jti in jtis)
+
+    built = []
+    class CountingBloomFilter(BloomFilter):
+        def __init__(self, *args):
+            built.append(self)
+            super().__init__(*args)
+    monkeypatch.setattr(revocation, "BloomFilter", CountingBloomFilter)
+
+    revocations.bloom.count = revocations.bloom.capacity
+    async def concurrent_checks():
+        return await asyncio.gather(*(is_revoked(revocations, jti) for jti in jtis))
+    assert all(run_async(concurrent_checks))
+    assert len(built) == 1
+    assert revocations.capacity >= 2 * len(jtis)
+
+def test_load_purges_expired_revocations(client, run_async):
+    expired, live = new_jti(), new_jti()
+    run_async(revoke, expired, timedelta(hours=-1))
+    run_async(revoke, live)
+    run_async(RevocationList(16, 0.01, 0).load)
+
+    async def stored():
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(RevokedToken.jti).where(RevokedToken.jti.in_([expired, live])))
+            return set(result.scalars())
+    assert run_async(stored) == {live}
@@ -0,0 +1,49 @@
+"""Fallback task search (InvertedIndex), which PostgreSQL-less setups use"""
+from src.search import InvertedIndex, Term, parse_query
+
+def build():
+    index = InvertedIndex()
+    documents = {
+        1: ("Fix login bug", "Users cannot log in with SSO"),
+        2: ("Write docs", "Document the login flow"),
+        3: ("Refactor", None),
+        4: ("Release notes", "Flow of the release"),
+    }
+    for doc_id, (title, description) in documents.items():
+        index.add(doc_id, title, "A")
+        index.add(doc_id, description, "B")
+    index.add(3, "this touches login code too", "C")
+    return index
+
+def ids(hits):
+    return [doc_id for doc_id, _ in hits]
+
+def test_parse_query():
+    assert parse_query('login -"sso flow" OR docs foo-bar') == [
+        [Term(("login",))],
+        [Term(("sso", "flow"), negated=True), Term(("docs",))],
+        [Term(("foo", "bar"))],
+    ]
+    assert parse_query("or -") == []
+
+def test_every_word_is_required():
+    assert sorted(ids(build().search("login flow"))) == [2]
+
+def test_title_hits_rank_first():
+    assert ids(build().search("login")) == [1, 2, 3]
+
+def test_negation_excludes():
+    index = build()
+    assert sorted(ids(index.search("login -sso"))) == [2, 3]
+    assert sorted(ids(index.search("-login"))) == [4]
+
+def test_or():
+    assert sorted(ids(build().search("sso OR release"))) == [1, 4]
+    assert sorted(ids(build().search("sso or release"))) == [1, 4]
+
+def test_phrase_needs_adjacent_words():
+    index = build()
+    assert ids(index.search('"login flow"')) == [2]
+    assert ids(index.search('"flow login"')) == []
+    # A phrase never spans the end of one field and the start of the next
+    assert ids(index.search('"sso this"')) == []